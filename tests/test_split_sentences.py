@@ -0,0 +1,54 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from начало import join_sentences, split_long, split_sentences
+
+
+def test_splits_on_sentence_end():
+    assert split_sentences("Boil water. Add pasta! Done?") == [["Boil water.", "Add pasta!", "Done?"]]
+
+
+def test_keeps_abbreviations_inside_sentence():
+    text = "Simmer approx. 5 mins. Use Dr. Oetker, e.g. Vanilla. Heat to gas No. 4 and bake."
+    assert split_sentences(text) == [
+        ["Simmer approx. 5 mins.", "Use Dr. Oetker, e.g. Vanilla.", "Heat to gas No. 4 and bake."]
+    ]
+
+
+def test_abbreviation_before_name():
+    assert split_sentences("approx. 5 mins. Mr. Smith said.") == [["approx. 5 mins.", "Mr. Smith said."]]
+
+
+def test_units_end_sentence():
+    text = "Bake for 1 hr. Serve hot. Add 2 tbsp. Stir in 1 tsp. Salt to taste. Say no. Then stop."
+    assert split_sentences(text) == [
+        ["Bake for 1 hr.", "Serve hot.", "Add 2 tbsp.", "Stir in 1 tsp.", "Salt to taste.", "Say no.", "Then stop."]
+    ]
+
+
+def test_abbreviation_must_be_whole_word():
+    assert split_sentences("Add the egg. Mix well.") == [["Add the egg.", "Mix well."]]
+
+
+def test_step_label_stays_with_step():
+    assert split_sentences("1. Heat oil.\nSTEP 2 Fry onions. Stir.") == [
+        ["1. Heat oil."],
+        ["STEP 2 Fry onions.", "Stir."],
+    ]
+
+
+def test_empty_text():
+    assert split_sentences("") == []
+    assert split_sentences("  \r\n ") == []
+
+
+def test_long_sentence_is_cut_by_words():
+    parts = split_long("word " * 10, limit=12)
+    assert parts == ["word word", "word word", "word word", "word word", "word word"]
+
+
+def test_join_restores_paragraphs():
+    paragraphs = split_sentences("Boil water. Add pasta.\r\n\r\nServe.")
+    assert join_sentences(paragraphs, [s.upper() for p in paragraphs for s in p]) == "BOIL WATER. ADD PASTA.\n\nSERVE."
@@ -0,0 +1,580 @@
+"""
+Воспроизводимые замеры горячих путей приложения без живых API.
+
+TheMealDB подменяется локальным HTTP-сервером с записанными (или
+сгенерированными) данными, переводчик — заглушкой с настраиваемой задержкой,
+экраны рисуются в настоящую ft.Page без окна. Каждый сценарий запускается
+в отдельном процессе и во временной папке, чтобы кэши и базы были чистыми.
+
+    python бенчмарк.py                       # все сценарии -> bench_results/*.json
+    python бенчмарк.py --compare old.json    # то же + сравнение с прошлым прогоном
+    python бенчмарк.py record                # записать настоящие ответы TheMealDB
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_FILE = os.path.join(HERE, "bench_fixtures.json")
+RESULTS_DIR = os.path.join(HERE, "bench_results")
+MEALDB_ORIGIN = "https://www.themealdb.com"
+API_PREFIX = "/api/json/v1/1/"
+SCENARIOS = ["cold_start", "view_recipe", "show_category_recipes", "perform_search", "favorites_10k"]
+COLD_START_RUNS = 5
+FAVORITES_ROWS = 10_000
+# Изменение медианы больше этого порога подсвечивается при --compare
+REGRESSION_THRESHOLD = 0.10
+
+# --- Данные ---------------------------------------------------------------
+
+SYNTHETIC_SEED = 42
+SYNTHETIC_MEALS = 300
+SYNTHETIC_CATEGORIES = [
+    "Beef", "Chicken", "Dessert", "Lamb", "Miscellaneous", "Pasta", "Pork",
+    "Seafood", "Side", "Starter", "Vegan", "Vegetarian", "Breakfast", "Goat",
+]
+SYNTHETIC_AREAS = [
+    "British", "Indian", "Italian", "French", "Mexican", "Chinese", "Japanese",
+    "Greek", "Thai", "Spanish", "Russian", "Turkish", "American", "Canadian",
+]
+SYNTHETIC_INGREDIENTS = [
+    "Chicken", "Chicken Breast", "Chicken Thighs", "Beef", "Minced Beef", "Lamb",
+    "Pork", "Bacon", "Salmon", "Prawns", "Rice", "Basmati Rice", "Pasta",
+    "Spaghetti", "Potatoes", "Onion", "Red Onions", "Garlic", "Ginger",
+    "Tomatoes", "Tomato Puree", "Carrots", "Celery", "Peas", "Mushrooms",
+    "Spinach", "Red Pepper", "Green Chilli", "Lemon", "Lime", "Butter",
+    "Olive Oil", "Vegetable Oil", "Milk", "Double Cream", "Eggs", "Flour",
+    "Sugar", "Brown Sugar", "Salt", "Black Pepper", "Paprika", "Cumin",
+    "Turmeric", "Coriander", "Parsley", "Thyme", "Rosemary", "Bay Leaf",
+    "Cheddar Cheese", "Parmesan", "Mozzarella", "Soy Sauce", "Honey",
+    "Chicken Stock", "Beef Stock", "Coconut Milk", "Chickpeas", "Lentils",
+    "Cinnamon", "Vanilla Extract", "Baking Powder", "Dark Chocolate", "Apples",
+]
+SYNTHETIC_MEASURES = ["1 tbs", "2 tbs", "1/2 tsp", "1 tsp", "175g", "400g", "1 cup", "2 cloves", "pinch", "to taste", "1 kg", "250ml"]
+SYNTHETIC_SENTENCES = [
+    "Preheat the oven to 180C.", "Heat the oil in a large pan.", "Add the onion and fry until soft.",
+    "Stir in the garlic and spices and cook for 1 minute.", "Add the meat and brown on all sides.",
+    "Pour in the stock and bring to the boil.", "Reduce the heat and simmer for 30 minutes.",
+    "Season with salt and pepper.", "Transfer to a baking dish.", "Bake for 25 minutes until golden.",
+    "Leave to rest for 5 minutes.", "Serve hot.", "Garnish with fresh herbs.",
+]
+
+def synthetic_fixtures(meals=SYNTHETIC_MEALS, seed=SYNTHETIC_SEED):
+    rng = random.Random(seed)
+    records = []
+    for n in range(meals):
+        category = rng.choice(SYNTHETIC_CATEGORIES)
+        main = rng.choice(SYNTHETIC_INGREDIENTS)
+        meal = {
+            "idMeal": str(60000 + n),
+            "strMeal": f"{main} {rng.choice(['Pie', 'Curry', 'Stew', 'Bake', 'Salad', 'Soup', 'Roast'])} {n}",
+            "strCategory": category,
+            "strArea": rng.choice(SYNTHETIC_AREAS),
+            "strTags": ",".join(rng.sample(["Meat", "Dinner", "Quick", "Spicy", "Baking", ""], 2)).strip(","),
+            "strMealThumb": f"{MEALDB_ORIGIN}/images/media/meals/bench{n}.jpg",
+            "strInstructions": "\r\n".join(rng.choice(SYNTHETIC_SENTENCES) for _ in range(rng.randint(5, 12))),
+        }
+        ingredients = [main] + rng.sample([i for i in SYNTHETIC_INGREDIENTS if i != main], rng.randint(6, 14))
+        for i in range(1, 21):
+            meal[f"strIngredient{i}"] = ingredients[i - 1] if i <= len(ingredients) else ""
+            meal[f"strMeasure{i}"] = rng.choice(SYNTHETIC_MEASURES) if i <= len(ingredients) else ""
+        records.append(meal)
+    return {
+        "categories": [
+            {
+                "strCategory": c,
+                "strCategoryThumb": f"{MEALDB_ORIGIN}/images/category/{c.lower()}.png",
+                "strCategoryDescription": "",
+            }
+            for c in SYNTHETIC_CATEGORIES
+        ],
+        "areas": SYNTHETIC_AREAS,
+        "ingredients": [{"strIngredient": i, "strDescription": None} for i in SYNTHETIC_INGREDIENTS],
+        "meals": records,
+    }
+
+def record_fixtures(path):
+    # Единственное место, где бенчмарк ходит в настоящий TheMealDB
+    sys.path.insert(0, HERE)
+    import начало
+
+    client = начало.MealDBClient()
+    meals = {}
+    for letter in "abcdefghijklmnopqrstuvwxyz0123456789":
+        for meal in client.search_by_letter(letter):
+            meals[meal["idMeal"]] = meal
+    data = {
+        "categories": client.list_categories(),
+        "areas": client.list_areas(),
+        "ingredients": client.list_ingredients(),
+        "meals": list(meals.values()),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    print(f"Записано {len(meals)} рецептов в {path}")
+
+def load_fixtures(path):
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return synthetic_fixtures()
+
+# --- Поддельный TheMealDB -------------------------------------------------
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Дочерний процесс завершается через os._exit и рвёт keep-alive соединения
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+class FakeMealDB:
+    """
+    Локальный TheMealDB: отвечает на filter/lookup/search/list/categories
+    из записанных данных и отдаёт заглушки картинок.
+    """
+
+    IMAGE_BYTES = b"\xff\xd8\xff" + b"\0" * 2048
+
+    def __init__(self, fixtures, latency_ms=0):
+        self.fixtures = fixtures
+        self.latency = latency_ms / 1000
+        self.meals = {m["idMeal"]: m for m in fixtures["meals"]}
+        self.requests = 0
+        self.server = QuietHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _card(self, meal):
+        return {"idMeal": meal["idMeal"], "strMeal": meal["strMeal"], "strMealThumb": meal["strMealThumb"]}
+
+    def answer(self, endpoint, params):
+        meals = self.fixtures["meals"]
+        if endpoint == "filter.php" and "c" in params:
+            found = [self._card(m) for m in meals if m.get("strCategory") == params["c"]]
+        elif endpoint == "filter.php" and "i" in params:
+            wanted = params["i"].replace("_", " ").lower()
+            found = [
+                self._card(m)
+                for m in meals
+                if any((m.get(f"strIngredient{i}") or "").lower() == wanted for i in range(1, 21))
+            ]
+        elif endpoint == "lookup.php":
+            found = [self.meals[params["i"]]] if params.get("i") in self.meals else []
+        elif endpoint == "search.php" and "f" in params:
+            found = [m for m in meals if m["strMeal"].lower().startswith(params["f"].lower())]
+        elif endpoint == "categories.php":
+            return {"categories": self.fixtures["categories"]}
+        elif endpoint == "list.php" and "a" in params:
+            found = [{"strArea": a} for a in self.fixtures["areas"]]
+        elif endpoint == "list.php" and "i" in params:
+            found = self.fixtures["ingredients"]
+        elif endpoint == "list.php" and "c" in params:
+            found = [{"strCategory": c["strCategory"]} for c in self.fixtures["categories"]]
+        else:
+            return None
+        return {"meals": found or None}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                fake.requests += 1
+                if fake.latency:
+                    time.sleep(fake.latency)
+                url = urlparse(self.path)
+                if url.path.startswith("/images/"):
+                    return self._send(200, fake.IMAGE_BYTES, "image/jpeg")
+                if not url.path.startswith(API_PREFIX):
+                    return self._send(404, b"", "text/plain")
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                data = fake.answer(url.path[len(API_PREFIX) :], params)
+                if data is None:
+                    return self._send(404, b"", "text/plain")
+                body = json.dumps(data, ensure_ascii=False).replace(MEALDB_ORIGIN, fake.url)
+                self._send(200, body.encode("utf-8"), "application/json")
+
+            def _send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+# --- Поддельный переводчик ------------------------------------------------
+
+class FakeTranslator:
+    """
+    Вместо GoogleTranslator: каждая строка ответа — "ru:" + исходная строка,
+    каждый вызов спит latency_ms, как сетевой запрос.
+    """
+
+    name = "fake"
+    max_bytes = None
+
+    def __init__(self, latency_ms, prefix):
+        self.latency = latency_ms / 1000
+        self.prefix = prefix
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def translate(self, text):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        if self.prefix == "ru:":
+            return "\n".join(f"ru:{line}" if line.strip() else line for line in text.split("\n"))
+        return "\n".join(line.split("ru:", 1)[-1] for line in text.split("\n"))
+
+# --- Страница без окна ----------------------------------------------------
+
+def headless_page():
+    """
+    Настоящая ft.Page с соединением-заглушкой: Flet строит дерево и считает
+    диффы как обычно, но команды никуда не отправляются.
+    """
+    # Внутренние модули Flet: написано под версию из requirements.txt
+    from flet.core.connection import Connection
+    from flet.core.page import Page
+    from flet.core.protocol import PageCommandsBatchResponsePayload
+
+    class HeadlessConnection(Connection):
+        def __init__(self):
+            super().__init__()
+            self._ids = itertools.count(1)
+            self.commands = 0
+
+        def send_command(self, session_id, command):
+            self.commands += 1
+            return PageCommandsBatchResponsePayload(results=[], error="")
+
+        def send_commands(self, session_id, commands):
+            self.commands += len(commands)
+            # На каждую команду add сервер возвращает id всех добавленных контролов
+            results = [
+                " ".join(f"_{next(self._ids)}" for _ in command.commands)
+                for command in commands
+                if command.name == "add"
+            ]
+            return PageCommandsBatchResponsePayload(results=results, error="")
+
+    page = Page(HeadlessConnection(), "bench", asyncio.new_event_loop())
+    page.window.width = 380
+    page.window.height = 800
+    return page
+
+# --- Сценарии (выполняются в дочернем процессе) ---------------------------
+
+def summarize(samples_ms):
+    ordered = sorted(samples_ms)
+    return {
+        "runs": len(ordered),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "min_ms": round(ordered[0], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - started) * 1000
+
+def point_to_server(app, server_url):
+    app.mealdb = app.Lazy(
+        lambda: app.MealDBClient(
+            base_url=server_url + API_PREFIX.rstrip("/"),
+            cache=app.ResponseCache("cache.db"),
+        )
+    )
+    app.async_mealdb = app.AsyncMealDBClient(app.mealdb)
+    # Карточки категорий на главном экране тоже не должны ходить на живой сайт
+    app.MEALDB_CATEGORY_IMAGE = app.MEALDB_CATEGORY_IMAGE.replace(MEALDB_ORIGIN, server_url)
+    # ASSETS_DIR указывает в репозиторий: кэш картинок держим во временной папке сценария
+    app.image_cache = app.Lazy(lambda: app.ImageCache(assets_dir=os.path.abspath("assets")))
+
+def setup_app(server_url, translator_latency_ms):
+    import начало
+
+    point_to_server(начало, server_url)
+    # Через TranslationRouter, чтобы в замеры попадал тот же путь, что и в приложении
+    начало.translator_en_ru._backend = начало.TranslationRouter([FakeTranslator(translator_latency_ms, "ru:")])
+    начало.translator_ru_en._backend = начало.TranslationRouter([FakeTranslator(translator_latency_ms, "")])
+    return начало
+
+def translator_calls(app):
+    return sum(t._backend.backends[0].calls for t in (app.translator_en_ru, app.translator_ru_en))
+
+def scenario_cold_start(args, fixtures):
+    started = time.perf_counter()
+    import начало
+
+    import_ms = (time.perf_counter() - started) * 1000
+    point_to_server(начало, args.server)
+    page = headless_page()
+    начало.main(page)
+    return {"import_ms": round(import_ms, 3), "first_frame_ms": round(начало.startup_metrics["first_frame_ms"], 3)}
+
+def scenario_view_recipe(args, fixtures):
+    app = setup_app(args.server, args.translator_latency)
+    page = headless_page()
+    app.main(page)
+    meal_ids = [m["idMeal"] for m in fixtures["meals"][: args.recipes]]
+
+    def open_and_close(meal_id):
+        app.view_recipe(page, meal_id)
+        app.go_back(page)
+
+    cold = [timed(open_and_close, m) for m in meal_ids]
+    calls_cold = translator_calls(app)
+    # Память предзагрузчика очищаем: второй проход идёт через дисковые кэши
+    app.recipe_prefetcher._memory.clear()
+    warm = [timed(open_and_close, m) for m in meal_ids]
+    memory = [timed(open_and_close, m) for m in meal_ids]
+    return {
+        "cold": summarize(cold),
+        "warm_disk_cache": summarize(warm),
+        "warm_memory": summarize(memory),
+        "translator_calls_cold": calls_cold,
+        "translator_calls_warm": translator_calls(app) - calls_cold,
+    }
+
+def scenario_show_category_recipes(args, fixtures):
+    app = setup_app(args.server, args.translator_latency)
+    page = headless_page()
+    app.main(page)
+    categories = [c["strCategory"] for c in fixtures["categories"]]
+
+    def open_and_close(category):
+        app.show_category_recipes(page, category)
+        app.go_back(page)
+
+    result = {}
+    for label in ("cold", "warm"):
+        started = time.perf_counter()
+        samples = [timed(open_and_close, c) for c in categories]
+        elapsed = time.perf_counter() - started
+        result[label] = dict(summarize(samples), per_second=round(len(categories) / elapsed, 2))
+    return result
+
+def search_queries(fixtures, count=20, seed=SYNTHETIC_SEED):
+    rng = random.Random(seed)
+    names = [i["strIngredient"] for i in fixtures["ingredients"]][:80]
+    return [", ".join(f"ru:{n}" for n in rng.sample(names, rng.randint(1, 3))) for _ in range(count)]
+
+def scenario_perform_search(args, fixtures):
+    import flet as ft
+
+    app = setup_app(args.server, args.translator_latency)
+    page = headless_page()
+    app.main(page)
+    app.open_search_screen(page)
+    results = ft.Ref[ft.Column]()
+    results.current = ft.Column()
+    page.views[-1].controls.append(results.current)
+    page.update()
+    queries = search_queries(fixtures)
+
+    def run_queries():
+        samples = []
+        started = time.perf_counter()
+        for query in queries:
+            samples.append(timed(app.perform_search, page, query, results))
+        return dict(summarize(samples), per_second=round(len(queries) / (time.perf_counter() - started), 2))
+
+    result = {"network_cold": run_queries(), "network_warm": run_queries()}
+    result["catalog_sync_ms"] = round(timed(app.catalog.sync, app.mealdb, app.translator_en_ru, lambda *a: None), 3)
+    result["catalog"] = run_queries()
+    return result
+
+def scenario_favorites_10k(args, fixtures):
+    import начало
+
+    repo = начало.FavoritesRepository("favorites.db")
+    recipes = fixtures["meals"]
+    rows = FAVORITES_ROWS
+    started = time.perf_counter()
+    for n in range(rows):
+        meal = recipes[n % len(recipes)]
+        repo.add(
+            f"bench{n}",
+            f"{meal['strMeal']} #{n}",
+            meal["strMealThumb"],
+            {"category": meal["strCategory"], "area": meal["strArea"]},
+        )
+    add_ms = (time.perf_counter() - started) * 1000
+    flush_ms = timed(repo.flush)
+
+    lookups = 100_000
+    started = time.perf_counter()
+    for n in range(lookups):
+        repo.contains(f"bench{n % (rows * 2)}")
+    contains_us = (time.perf_counter() - started) * 1e6 / lookups
+
+    pages = {}
+    for sort in начало.FAVORITES_SORTS:
+        samples = []
+        cursor = None
+        while True:
+            started = time.perf_counter()
+            _, cursor = repo.page(sort=sort, after=cursor)
+            samples.append((time.perf_counter() - started) * 1000)
+            if cursor is None:
+                break
+        pages[sort] = summarize(samples)
+    category = recipes[0]["strCategory"]
+    return {
+        "rows": rows,
+        "add_all_ms": round(add_ms, 3),
+        "flush_ms": round(flush_ms, 3),
+        "contains_us": round(contains_us, 4),
+        "last_ms": round(timed(repo.last), 3),
+        "page": pages,
+        "filtered_page_ms": round(timed(repo.page, "title", category), 3),
+    }
+
+# --- Запуск ---------------------------------------------------------------
+
+def run_scenario_process(name, args, server_url, workdir):
+    result_file = os.path.join(workdir, "result.json")
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        "--scenario", name,
+        "--server", server_url,
+        "--result", result_file,
+        "--translator-latency", str(args.translator_latency),
+        "--recipes", str(args.recipes),
+    ]
+    if args.fixtures:
+        command += ["--fixtures", os.path.abspath(args.fixtures)]
+    env = dict(os.environ, PYTHONPATH=HERE + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    subprocess.run(command, cwd=workdir, env=env, check=True, stdout=subprocess.DEVNULL)
+    with open(result_file, encoding="utf-8") as f:
+        return json.load(f)
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def medians(tree, prefix=""):
+    for key, value in tree.items():
+        if isinstance(value, dict):
+            yield from medians(value, f"{prefix}{key}.")
+        elif key.endswith("_ms") and key not in ("p95_ms", "min_ms", "max_ms"):
+            yield prefix + key, value
+
+def compare(previous, current):
+    old = dict(medians(previous["results"]))
+    print(f"{'метрика':<52}{'было':>10}{'стало':>10}{'изм.':>9}")
+    for key, value in medians(current["results"]):
+        if key not in old or not old[key]:
+            continue
+        change = (value - old[key]) / old[key]
+        mark = "  <-- хуже" if change > REGRESSION_THRESHOLD else ""
+        print(f"{key:<52}{old[key]:>10.1f}{value:>10.1f}{change:>+9.0%}{mark}")
+
+def run_all(args):
+    fixtures = load_fixtures(args.fixtures)
+    server = FakeMealDB(fixtures, args.server_latency).start()
+    results = {}
+    try:
+        for name in args.scenarios:
+            if name == "cold_start":
+                samples = []
+                for _ in range(COLD_START_RUNS):
+                    with tempfile.TemporaryDirectory() as workdir:
+                        samples.append(run_scenario_process(name, args, server.url, workdir))
+                results[name] = {
+                    "import": summarize([s["import_ms"] for s in samples]),
+                    "first_frame": summarize([s["first_frame_ms"] for s in samples]),
+                }
+            else:
+                with tempfile.TemporaryDirectory() as workdir:
+                    results[name] = run_scenario_process(name, args, server.url, workdir)
+            print(f"{name}: готово")
+    finally:
+        server.stop()
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "config": {
+            "fixtures": "recorded" if args.fixtures and os.path.exists(args.fixtures) else "synthetic",
+            "meals": len(fixtures["meals"]),
+            "translator_latency_ms": args.translator_latency,
+            "server_latency_ms": args.server_latency,
+            "recipes": args.recipes,
+        },
+        "results": results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{report['revision'] or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты: {out}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки Culinary Mastermind на локальных заглушках")
+    parser.add_argument("command", nargs="?", choices=["run", "record"], default="run")
+    parser.add_argument("--fixtures", default=FIXTURES_FILE, help="JSON с записанными ответами (иначе синтетика)")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--translator-latency", type=float, default=80, help="задержка одного вызова переводчика, мс")
+    parser.add_argument("--server-latency", type=float, default=20, help="задержка ответа TheMealDB, мс")
+    parser.add_argument("--recipes", type=int, default=20, help="сколько рецептов открывать в view_recipe")
+    parser.add_argument("--out", help="куда записать JSON с результатами")
+    parser.add_argument("--compare", help="прошлый JSON для сравнения")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--server", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        fixtures = load_fixtures(args.fixtures)
+        result = globals()[f"scenario_{args.scenario}"](args, fixtures)
+        with open(args.result, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        # Фоновые потоки приложения (картинки, запись избранного) не должны держать процесс
+        os._exit(0)
+    elif args.command == "record":
+        record_fixtures(args.fixtures)
+    else:
+        run_all(args)
+
+if __name__ == "__main__":
+    main()
@@ -1,841 +1,3680 @@
-import flet as ft
-import requests
-import sqlite3
-from deep_translator import GoogleTranslator
-
-translator_ru_en = GoogleTranslator(source="ru", target="en")
-translator_en_ru = GoogleTranslator(source="en", target="ru")
-
-def init_db():
-    conn = sqlite3.connect("favorites.db")
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS favorites (
-            meal_id   TEXT PRIMARY KEY,
-            title     TEXT,
-            image_url TEXT
-        )
-        """
-    )
-    conn.commit()
-    conn.close()
-
-def add_to_favorites(meal_id, title, image_url):
-    conn = sqlite3.connect("favorites.db")
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT INTO favorites (meal_id, title, image_url) VALUES (?, ?, ?)",
-            (meal_id, title, image_url),
-        )
-        conn.commit()
-    except sqlite3.IntegrityError:
-        pass
-    conn.close()
-
-def remove_from_favorites(meal_id):
-    conn = sqlite3.connect("favorites.db")
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM favorites WHERE meal_id = ?", (meal_id,))
-    conn.commit()
-    conn.close()
-
-def is_favorite(meal_id):
-    conn = sqlite3.connect("favorites.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT 1 FROM favorites WHERE meal_id = ?", (meal_id,))
-    result = cursor.fetchone() is not None
-    conn.close()
-    return result
-
-def get_last_favorite():
-    conn = sqlite3.connect("favorites.db")
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT meal_id, title, image_url FROM favorites ORDER BY rowid DESC LIMIT 1"
-    )
-    row = cursor.fetchone()
-    conn.close()
-    return row
-
-def get_all_favorites():
-    conn = sqlite3.connect("favorites.db")
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT meal_id, title, image_url FROM favorites ORDER BY rowid DESC"
-    )
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
-
-def category_card(title_ru: str, image_url: str, category_en: str, page: ft.Page):
-    return ft.Card(
-        width=180,
-        height=220,
-        content=ft.Container(
-            bgcolor="#1F1F2A",
-            padding=10,
-            border_radius=ft.border_radius.all(15),
-            content=ft.Column(
-                spacing=8,
-                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                controls=[
-                    ft.Image(
-                        src=image_url,
-                        width=160,
-                        height=80,
-                        fit=ft.ImageFit.COVER,
-                    ),
-                    ft.Text(
-                        title_ru,
-                        color=ft.Colors.WHITE,
-                        size=16,
-                        weight=ft.FontWeight.BOLD,
-                        font_family="Poppins",
-                        no_wrap=True,
-                        max_lines=1,
-                        text_align=ft.TextAlign.CENTER,
-                    ),
-                    ft.ElevatedButton(
-                        text="Подробнее",
-                        bgcolor=ft.Colors.PINK_400,
-                        color=ft.Colors.WHITE,
-                        on_click=lambda e, c=category_en: show_category_recipes(
-                            page, c
-                        ),
-                    ),
-                ],
-            ),
-        ),
-        elevation=5,
-    )
-
-def show_category_recipes(page: ft.Page, category_en: str):
-    page.controls.clear()
-
-    category_ru = translator_en_ru.translate(category_en)
-    top_bar = ft.Row(
-        [
-            ft.IconButton(
-                ft.Icons.ARROW_BACK,
-                icon_color=ft.Colors.WHITE,
-                icon_size=28,
-                on_click=lambda e: main(page),
-            ),
-            ft.Text(
-                category_ru,
-                color=ft.Colors.WHITE,
-                size=24,
-                weight=ft.FontWeight.BOLD,
-            ),
-        ],
-        alignment=ft.MainAxisAlignment.START,
-    )
-
-    results_column = ft.Column(scroll=ft.ScrollMode.AUTO, expand=True, spacing=10)
-    results_column.controls.append(
-        ft.Container(
-            content=ft.ProgressRing(
-                width=50,
-                height=50,
-                stroke_width=6,
-                color=ft.Colors.PINK_400,
-            ),
-            alignment=ft.alignment.center,
-            padding=20,
-        )
-    )
-
-    page.add(
-        ft.Column(
-            width=page.window.width,
-            spacing=20,
-            expand=True,
-            controls=[top_bar, results_column],
-        )
-    )
-    page.update()
-
-    url = f"https://www.themealdb.com/api/json/v1/1/filter.php?c={category_en}"
-    try:
-        meals = requests.get(url).json().get("meals", [])
-    except Exception:
-        meals = []
-
-    results_column.controls.clear()
-    if meals:
-        for m in meals:
-            meal_id = m["idMeal"]
-            title_ru = translator_en_ru.translate(m["strMeal"])
-            img_url = m["strMealThumb"]
-
-            card = ft.Container(
-                bgcolor="#1F1F2A",
-                border_radius=ft.border_radius.all(15),
-                padding=15,
-                margin=ft.margin.symmetric(horizontal=10),
-                content=ft.Column(
-                    spacing=12,
-                    controls=[
-                        ft.Row(
-                            alignment=ft.MainAxisAlignment.CENTER,
-                            controls=[
-                                ft.Container(
-                                    border_radius=ft.border_radius.all(15),
-                                    clip_behavior=ft.ClipBehavior.ANTI_ALIAS,
-                                    content=ft.Image(
-                                        src=img_url,
-                                        width=page.window.width - 60,
-                                        height=180,
-                                        fit=ft.ImageFit.COVER,
-                                    ),
-                                ),
-                            ],
-                        ),
-                        ft.Text(
-                            title_ru,
-                            color=ft.Colors.WHITE,
-                            size=20,
-                            weight=ft.FontWeight.BOLD,
-                            font_family="Montserrat",
-                        ),
-                        ft.ElevatedButton(
-                            text="Подробнее",
-                            bgcolor=ft.Colors.PINK_400,
-                            color=ft.Colors.WHITE,
-                            height=48,
-                            style=ft.ButtonStyle(padding=8),
-                            on_click=lambda e, m_id=meal_id: view_recipe(page, m_id),
-                        ),
-                    ],
-                ),
-            )
-            results_column.controls.append(card)
-    else:
-        results_column.controls.append(
-            ft.Text("Рецепты не найдены", color=ft.Colors.WHITE, size=20)
-        )
-    page.update()
-
-def main(page: ft.Page):
-    init_db()
-    page.title = "Culinary Mastermind"
-    page.window.frameless = True
-    page.window.width = 380
-    page.window.height = 800
-    page.window.resizable = False
-
-    page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
-    page.vertical_alignment = ft.MainAxisAlignment.START
-    page.padding = 0
-    page.bgcolor = "#2C2C3E"
-
-    header_text = ft.Text(
-        value="Culinary Mastermind",
-        size=32,
-        weight=ft.FontWeight.BOLD,
-        color=ft.Colors.WHITE,
-        font_family="Poppins",
-    )
-
-    subheader_text = ft.Text(
-        value="Готовьте шедевры из того, что есть в холодильнике!",
-        size=18,
-        color=ft.Colors.GREY_300,
-        font_family="Roboto",
-    )
-
-    recipes_row = ft.Row(
-        spacing=10,
-        scroll=ft.ScrollMode.AUTO,
-        controls=[
-            category_card(
-                "Курица",
-                "https://www.themealdb.com/images/category/chicken.png",
-                "Chicken",
-                page,
-            ),
-            category_card(
-                "Говядина",
-                "https://www.themealdb.com/images/category/beef.png",
-                "Beef",
-                page,
-            ),
-            category_card(
-                "Морепродукты",
-                "https://www.themealdb.com/images/category/seafood.png",
-                "Seafood",
-                page,
-            ),
-        ],
-    )
-
-    def recipe_card(title: str, prep_time: int, calories: int, image_url: str):
-        return ft.Card(
-            width=160,
-            height=250,
-            content=ft.Container(
-                bgcolor="#1F1F2A",
-                padding=10,
-                border_radius=ft.border_radius.all(15),
-                content=ft.Column(
-                    spacing=3,
-                    controls=[
-                        ft.Image(
-                            src=image_url,
-                            width=120,
-                            height=50,
-                            fit=ft.ImageFit.COVER,
-                        ),
-                        ft.Text(
-                            title,
-                            color=ft.Colors.WHITE,
-                            size=18,
-                            weight=ft.FontWeight.BOLD,
-                            font_family="Poppins",
-                        ),
-                        ft.Text(
-                            f"Время: {prep_time} мин",
-                            color=ft.Colors.GREY_300,
-                            size=14,
-                            font_family="Roboto",
-                        ),
-                        ft.Text(
-                            f"Калории: {calories}",
-                            color=ft.Colors.GREY_300,
-                            size=14,
-                            font_family="Roboto",
-                        ),
-                        ft.ElevatedButton(
-                            text="Подробнее",
-                            bgcolor=ft.Colors.PINK_400,
-                            color=ft.Colors.WHITE,
-                            height=40,
-                            style=ft.ButtonStyle(padding=5),
-                            on_click=lambda e: print(f"Подробности рецепта: {title}"),
-                        ),
-                    ],
-                ),
-            ),
-            elevation=10,
-        )
-
-    def load_last_favorite():
-        row = get_last_favorite()
-        if row is None:
-            return ft.Text("Нет избранного", color=ft.Colors.WHITE, size=16)
-        meal_id, title, image_url = row
-        return ft.Container(
-            padding=10,
-            bgcolor="#2E2F45",
-            border_radius=ft.border_radius.all(10),
-            margin=ft.margin.symmetric(vertical=5),
-            content=ft.Row(
-                spacing=10,
-                controls=[
-                    ft.Icon(ft.Icons.FAVORITE, color=ft.Colors.PINK_400, size=24),
-                    ft.Text(
-                        title,
-                        color=ft.Colors.WHITE,
-                        size=16,
-                        font_family="Roboto",
-                        expand=True,
-                    ),
-                    ft.ElevatedButton(
-                        text="Подробнее",
-                        bgcolor=ft.Colors.PINK_400,
-                        color=ft.Colors.WHITE,
-                        on_click=lambda e, m_id=meal_id: view_recipe(page, m_id),
-                    ),
-                ],
-            ),
-        )
-
-    last_fav_control = load_last_favorite()
-
-    top_bar = ft.Row(
-        [
-            ft.IconButton(
-                ft.Icons.MENU,
-                icon_color=ft.Colors.WHITE,
-                on_click=lambda e: open_side_menu(page),
-            ),
-            ft.Container(expand=True),
-        ],
-        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-    )
-
-    search_button_container = ft.Container(
-        content=ft.IconButton(
-            ft.Icons.SEARCH,
-            icon_size=40,
-            icon_color=ft.Colors.WHITE,
-            bgcolor=ft.Colors.PINK_400,
-            on_click=lambda e: open_search_screen(page),
-        ),
-        alignment=ft.Alignment(0, 1),
-        margin=ft.margin.only(top=20),
-    )
-
-    main_content = ft.Column(
-        width=page.window.width,
-        spacing=20,
-        alignment=ft.MainAxisAlignment.START,
-        controls=[
-            top_bar,
-            header_text,
-            subheader_text,
-            recipes_row,
-            ft.Text(
-                "Избранное",
-                size=20,
-                weight=ft.FontWeight.BOLD,
-                color=ft.Colors.WHITE,
-                font_family="Poppins",
-            ),
-            last_fav_control,
-        ],
-    )
-
-    side_menu = ft.Container(
-        visible=False,
-        expand=True,
-        on_click=lambda e: close_side_menu(page),
-        bgcolor=ft.Colors.with_opacity(0.5, ft.Colors.BLACK),
-        content=ft.Row(
-            expand=True,
-            alignment=ft.MainAxisAlignment.START,
-            controls=[
-                ft.Container(
-                    width=220,
-                    bgcolor="#2E2F45",
-                    padding=20,
-                    content=ft.Column(
-                        spacing=10,
-                        controls=[
-                            ft.Text(
-                                "Меню",
-                                color=ft.Colors.WHITE,
-                                size=20,
-                                weight=ft.FontWeight.BOLD,
-                            ),
-                            ft.Divider(color=ft.Colors.GREY_700),
-                            ft.Container(
-                                on_click=lambda e: favorites_menu_click(page),
-                                content=ft.Row(
-                                    spacing=5,
-                                    controls=[
-                                        ft.Icon(
-                                            ft.Icons.STAR,
-                                            color=ft.Colors.ORANGE,
-                                            size=24,
-                                        ),
-                                        ft.Text(
-                                            "Избранное",
-                                            color=ft.Colors.WHITE,
-                                            size=16,
-                                        ),
-                                    ],
-                                ),
-                            ),
-                        ],
-                    ),
-                ),
-                ft.Container(expand=True),
-            ],
-        ),
-    )
-
-    def close_side_menu(page: ft.Page):
-        side_menu.visible = False
-        page.update()
-
-    def open_side_menu(page: ft.Page):
-        side_menu.visible = True
-        page.update()
-
-    def favorites_menu_click(page: ft.Page):
-        close_side_menu(page)
-        open_favorites_screen(page)
-
-    page.controls.clear()
-    page.add(ft.Stack(expand=True, controls=[main_content, side_menu]), search_button_container)
-    page.update()
-
-def open_search_screen(page: ft.Page):
-    page.controls.clear()
-    top_bar = ft.Row(
-        [
-            ft.IconButton(
-                ft.Icons.ARROW_BACK,
-                icon_color=ft.Colors.WHITE,
-                icon_size=28,
-                on_click=lambda e: main(page),
-            ),
-        ],
-        alignment=ft.MainAxisAlignment.START,
-    )
-    search_field = ft.TextField(
-        label="Введите ингредиенты (на русском)",
-        autofocus=True,
-        bgcolor="#2C2E3E",
-        border_radius=ft.border_radius.all(20),
-        color=ft.Colors.WHITE,
-        prefix_icon=ft.Icon(ft.Icons.SEARCH, color=ft.Colors.PINK_400, size=24),
-        height=55,
-        width=page.window.width - 40,
-        text_size=18,
-    )
-    results_column_ref = ft.Ref[ft.Column]()
-    results_column = ft.Column(
-        ref=results_column_ref, scroll=ft.ScrollMode.AUTO, expand=True, spacing=10
-    )
-
-    def search_handler(e):
-        perform_search(page, search_field.value, results_column_ref)
-
-    search_field.on_submit = search_handler
-
-    page.add(
-        ft.Column(
-            width=page.window.width,
-            spacing=20,
-            expand=True,
-            controls=[
-                top_bar,
-                ft.Container(padding=20, content=search_field),
-                results_column,
-            ],
-        )
-    )
-    page.update()
-
-def perform_search(page: ft.Page, query: str, results_ref: ft.Ref[ft.Column]):
-    results_column = results_ref.current
-    results_column.controls.clear()
-    results_column.controls.append(
-        ft.Container(
-            content=ft.ProgressRing(
-                width=60, height=60, stroke_width=8, color=ft.Colors.PINK_400
-            ),
-            alignment=ft.alignment.center,
-            padding=20,
-        )
-    )
-    page.update()
-
-    translated_query = translator_ru_en.translate(query)
-    url = f"https://www.themealdb.com/api/json/v1/1/filter.php?i={translated_query}"
-    try:
-        meals = requests.get(url).json().get("meals", [])
-    except Exception:
-        meals = []
-
-    results_column.controls.clear()
-    if meals:
-        for m in meals:
-            meal_id = m["idMeal"]
-            title_ru = translator_en_ru.translate(m["strMeal"])
-            img_url = m["strMealThumb"]
-            card = ft.Container(
-                bgcolor="#1F1F2A",
-                border_radius=ft.border_radius.all(15),
-                padding=15,
-                margin=ft.margin.symmetric(horizontal=10),
-                content=ft.Column(
-                    spacing=12,
-                    controls=[
-                        ft.Row(
-                            alignment=ft.MainAxisAlignment.CENTER,
-                            controls=[
-                                ft.Container(
-                                    border_radius=ft.border_radius.all(15),
-                                    clip_behavior=ft.ClipBehavior.ANTI_ALIAS,
-                                    content=ft.Image(
-                                        src=img_url,
-                                        width=page.window.width - 60,
-                                        height=180,
-                                        fit=ft.ImageFit.COVER,
-                                    ),
-                                ),
-                            ],
-                        ),
-                        ft.Text(
-                            title_ru,
-                            color=ft.Colors.WHITE,
-                            size=20,
-                            weight=ft.FontWeight.BOLD,
-                            font_family="Montserrat",
-                        ),
-                        ft.ElevatedButton(
-                            text="Подробнее",
-                            bgcolor=ft.Colors.PINK_400,
-                            color=ft.Colors.WHITE,
-                            height=48,
-                            style=ft.ButtonStyle(padding=8),
-                            on_click=lambda e, m_id=meal_id: view_recipe(page, m_id),
-                        ),
-                    ],
-                ),
-            )
-            results_column.controls.append(card)
-    else:
-        results_column.controls.append(
-            ft.Text("Рецепты не найдены", color=ft.Colors.WHITE, size=20)
-        )
-    page.update()
-
-def view_recipe(page: ft.Page, meal_id: str):
-    url = f"https://www.themealdb.com/api/json/v1/1/lookup.php?i={meal_id}"
-    try:
-        meal = requests.get(url).json()["meals"][0]
-    except Exception:
-        meal = None
-
-    if not meal:
-        print("Рецепт не найден или произошла ошибка.")
-        return
-
-    title_ru = translator_en_ru.translate(meal["strMeal"])
-    instructions_ru = translator_en_ru.translate(meal.get("strInstructions", ""))
-    image_url = meal["strMealThumb"]
-    category_ru = translator_en_ru.translate(meal.get("strCategory") or "")
-    area_ru = translator_en_ru.translate(meal.get("strArea") or "")
-    tags_ru = translator_en_ru.translate(meal.get("strTags") or "")
-
-    instructions_lines = [line.strip() for line in instructions_ru.split("\n") if line.strip()]
-    ingredients = []
-    for i in range(1, 21):
-        ing = meal.get(f"strIngredient{i}")
-        measure = meal.get(f"strMeasure{i}")
-        if ing and ing.strip():
-            ingredients.append(translator_en_ru.translate(f"{ing} - {measure}"))
-
-    heart_button = ft.IconButton(
-        icon=ft.Icons.FAVORITE if is_favorite(meal_id) else ft.Icons.FAVORITE_BORDER,
-        icon_color=ft.Colors.PINK_400,
-        icon_size=28,
-    )
-
-    def toggle_favorite(e):
-        if is_favorite(meal_id):
-            remove_from_favorites(meal_id)
-            heart_button.icon = ft.Icons.FAVORITE_BORDER
-        else:
-            add_to_favorites(meal_id, title_ru, image_url)
-            heart_button.icon = ft.Icons.FAVORITE
-        heart_button.update()
-
-    heart_button.on_click = toggle_favorite
-
-    top_bar = ft.Row(
-        [
-            ft.IconButton(
-                ft.Icons.ARROW_BACK,
-                icon_color=ft.Colors.WHITE,
-                icon_size=28,
-                on_click=lambda e: main(page),
-            ),
-            heart_button,
-        ],
-        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-    )
-
-    area_card = ft.Container(
-        bgcolor="#34354A",
-        border_radius=ft.border_radius.all(15),
-        padding=ft.padding.symmetric(horizontal=10, vertical=8),
-        content=ft.Column(
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            spacing=3,
-            controls=[
-                ft.Icon(ft.Icons.PLACE, color=ft.Colors.PINK_400, size=24),
-                ft.Text(area_ru, color=ft.Colors.WHITE, size=18),
-            ],
-        ),
-    )
-    category_card_ctrl = ft.Container(
-        bgcolor="#34354A",
-        border_radius=ft.border_radius.all(15),
-        padding=ft.padding.symmetric(horizontal=10, vertical=8),
-        content=ft.Column(
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            spacing=3,
-            controls=[
-                ft.Icon(ft.Icons.CATEGORY, color=ft.Colors.PINK_400, size=24),
-                ft.Text(category_ru, color=ft.Colors.WHITE, size=18),
-            ],
-        ),
-    )
-    tags_card = ft.Container(
-        bgcolor="#34354A",
-        border_radius=ft.border_radius.all(15),
-        padding=ft.padding.symmetric(horizontal=10, vertical=8),
-        content=ft.Column(
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            spacing=3,
-            controls=[
-                ft.Icon(ft.Icons.LABEL, color=ft.Colors.PINK_400, size=24),
-                ft.Text(tags_ru, color=ft.Colors.WHITE, size=18),
-            ],
-        ),
-    )
-
-    detail_column = ft.Column(
-        scroll=ft.ScrollMode.AUTO,
-        expand=True,
-        spacing=20,
-        controls=[
-            ft.Row(
-                alignment=ft.MainAxisAlignment.CENTER,
-                controls=[
-                    ft.Container(
-                        border_radius=ft.border_radius.all(20),
-                        clip_behavior=ft.ClipBehavior.ANTI_ALIAS,
-                        content=ft.Image(
-                            src=image_url,
-                            width=page.window.width - 40,
-                            height=220,
-                            fit=ft.ImageFit.COVER,
-                        ),
-                    )
-                ],
-            ),
-            ft.Text(title_ru, color=ft.Colors.WHITE, size=28, weight=ft.FontWeight.BOLD),
-            ft.Row(
-                spacing=20,
-                alignment=ft.MainAxisAlignment.CENTER,
-                controls=[area_card, category_card_ctrl, tags_card],
-            ),
-            ft.Text(
-                "Ингредиенты:",
-                color=ft.Colors.PINK_400,
-                size=22,
-                weight=ft.FontWeight.BOLD,
-            ),
-            ft.Column(
-                spacing=8,
-                controls=[
-                    ft.Row(
-                        spacing=8,
-                        controls=[
-                            ft.Icon(
-                                ft.Icons.FIBER_MANUAL_RECORD,
-                                color=ft.Colors.PINK_400,
-                                size=26,
-                            ),
-                            ft.Text(
-                                i,
-                                color=ft.Colors.WHITE,
-                                size=18,
-                                width=page.window.width - 80,
-                            ),
-                        ],
-                    )
-                    for i in ingredients
-                ],
-            ),
-            ft.Text(
-                "Инструкции:",
-                color=ft.Colors.PINK_400,
-                size=22,
-                weight=ft.FontWeight.BOLD,
-            ),
-            ft.Column(
-                spacing=8,
-                controls=[
-                    ft.Row(
-                        spacing=8,
-                        controls=[
-                            ft.Icon(
-                                ft.Icons.FIBER_MANUAL_RECORD,
-                                color=ft.Colors.PINK_400,
-                                size=26,
-                            ),
-                            ft.Text(
-                                l,
-                                color=ft.Colors.WHITE,
-                                size=18,
-                                width=page.window.width - 80,
-                            ),
-                        ],
-                    )
-                    for l in instructions_lines
-                ],
-            ),
-        ],
-    )
-
-    page.controls.clear()
-    page.add(ft.Column(spacing=20, expand=True, controls=[top_bar, detail_column]))
-    page.update()
-
-def open_favorites_screen(page: ft.Page):
-    page.controls.clear()
-    top_bar = ft.Row(
-        [
-            ft.IconButton(
-                ft.Icons.ARROW_BACK,
-                icon_color=ft.Colors.WHITE,
-                icon_size=28,
-                on_click=lambda e: main(page),
-            ),
-            ft.Container(expand=True),
-        ],
-        alignment=ft.MainAxisAlignment.START,
-    )
-
-    favs = get_all_favorites()
-    fav_controls = []
-    if favs:
-        for meal_id, title, img in favs:
-            fav_controls.append(
-                ft.Container(
-                    padding=10,
-                    bgcolor="#2E2F45",
-                    border_radius=ft.border_radius.all(10),
-                    margin=ft.margin.symmetric(vertical=5),
-                    content=ft.Row(
-                        spacing=10,
-                        controls=[
-                            ft.Icon(ft.Icons.FAVORITE, color=ft.Colors.PINK_400, size=24),
-                            ft.Text(title, color=ft.Colors.WHITE, size=16, expand=True),
-                            ft.ElevatedButton(
-                                text="Подробнее",
-                                bgcolor=ft.Colors.PINK_400,
-                                color=ft.Colors.WHITE,
-                                on_click=lambda e, m=meal_id: view_recipe(page, m),
-                            ),
-                        ],
-                    ),
-                )
-            )
-    else:
-        fav_controls.append(
-            ft.Text("Избранное пустое", color=ft.Colors.WHITE, size=20)
-        )
-
-    page.add(
-        ft.Column(
-            spacing=20,
-            expand=True,
-            controls=[
-                top_bar,
-                ft.Text(
-                    "Все избранные рецепты",
-                    color=ft.Colors.WHITE,
-                    size=24,
-                    weight=ft.FontWeight.BOLD,
-                ),
-                ft.Container(
-                    expand=True, padding=20, content=ft.Column(spacing=10, controls=fav_controls)
-                ),
-            ],
-        )
-    )
-    page.update()
-
-if __name__ == "__main__":
-    ft.app(target=main)
+from __future__ import annotations
+
+import time
+
+PROCESS_START = time.perf_counter()
+
+import asyncio
+import atexit
+import hashlib
+import importlib
+import json
+import os
+import queue
+import random
+import re
+import sqlite3
+import string
+import sys
+import threading
+import unicodedata
+from collections import Counter, OrderedDict, defaultdict, deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from difflib import get_close_matches
+from fractions import Fraction
+from urllib.parse import urlencode
+
+class LazyModule:
+    """
+    Модуль, который импортируется при первом обращении к его атрибуту.
+    flet, requests и deep_translator не нужны, пока не открыт первый экран
+    или не сделан первый запрос.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+class Lazy:
+    """
+    Объект, который создаётся при первом обращении (один раз на процесс).
+    Так открытие баз и создание схем не стоят на пути к первому кадру.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def instance(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    def is_loaded(self):
+        return self._instance is not None
+
+    def __getattr__(self, attr):
+        return getattr(self.instance(), attr)
+
+ft = LazyModule("flet")
+requests = LazyModule("requests")
+
+TRACE_ENV = "CULINARY_TRACE"
+TRACE_FILE = "trace.json"
+TRACE_MAX_EVENTS = 200_000
+# Границы корзин гистограммы задержек, мс
+TRACE_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+class Tracer:
+    """
+    Спаны вокруг запросов к TheMealDB, вызовов переводчика, операций SQLite
+    и page.update. Включается переменной окружения CULINARY_TRACE
+    (1 или путь к .json); при выходе пишет Chrome trace JSON и печатает сводку.
+    """
+
+    def __init__(self, enabled=False, path=TRACE_FILE):
+        self.enabled = enabled
+        self.path = path
+        self._lock = threading.Lock()
+        self._events = []
+        self._stats = defaultdict(lambda: {"count": 0, "total": 0.0, "max": 0.0, "bytes": 0, "buckets": [0] * (len(TRACE_BUCKETS_MS) + 1)})
+        self._start = time.perf_counter()
+        if enabled:
+            atexit.register(self.finish)
+
+    @classmethod
+    def from_env(cls):
+        value = os.environ.get(TRACE_ENV, "")
+        if value in ("", "0"):
+            return cls(False)
+        return cls(True, value if value.endswith(".json") else TRACE_FILE)
+
+    def span(self, name, cat, **args):
+        if not self.enabled:
+            return nullcontext({})
+        return self._span(name, cat, args)
+
+    @contextmanager
+    def _span(self, name, cat, args):
+        started = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.record(name, cat, started, time.perf_counter(), args)
+
+    def record(self, name, cat, started, finished, args):
+        duration_ms = (finished - started) * 1000
+        with self._lock:
+            stat = self._stats[(cat, name)]
+            stat["count"] += 1
+            stat["total"] += duration_ms
+            stat["max"] = max(stat["max"], duration_ms)
+            stat["bytes"] += args.get("bytes", 0)
+            bucket = next((i for i, edge in enumerate(TRACE_BUCKETS_MS) if duration_ms <= edge), len(TRACE_BUCKETS_MS))
+            stat["buckets"][bucket] += 1
+            if len(self._events) < TRACE_MAX_EVENTS:
+                self._events.append(
+                    {
+                        "name": name,
+                        "cat": cat,
+                        "ph": "X",
+                        "ts": (started - self._start) * 1e6,
+                        "dur": duration_ms * 1000,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                        "args": args,
+                    }
+                )
+
+    def traced(self, name, cat, func):
+        def wrapper(*args, **kwargs):
+            with self.span(name, cat):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def instrument_page(self, page: ft.Page):
+        if self.enabled and not page.session.get("traced"):
+            page.session.set("traced", True)
+            page.update = self.traced("page.update", "render", page.update)
+
+    def export_chrome(self, path=None):
+        with self._lock:
+            events = list(self._events)
+        with open(path or self.path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False, default=str)
+
+    def summary(self):
+        with self._lock:
+            stats = sorted(self._stats.items(), key=lambda item: -item[1]["total"])
+        lines = [f"{'категория':<12}{'операция':<28}{'кол-во':>8}{'сред, мс':>10}{'макс, мс':>10}{'всего, мс':>11}{'байт':>12}"]
+        for (cat, name), stat in stats:
+            lines.append(
+                f"{cat:<12}{name[:27]:<28}{stat['count']:>8}{stat['total'] / stat['count']:>10.1f}"
+                f"{stat['max']:>10.1f}{stat['total']:>11.0f}{stat['bytes']:>12}"
+            )
+            edges = [f"<={edge}" for edge in TRACE_BUCKETS_MS] + [f">{TRACE_BUCKETS_MS[-1]}"]
+            lines.append(
+                "            "
+                + " ".join(f"{edge}:{count}" for edge, count in zip(edges, stat["buckets"]) if count)
+            )
+        return "\n".join(lines)
+
+    def finish(self):
+        self.export_chrome()
+        print(self.summary())
+        print(f"Трассировка записана в {self.path} (chrome://tracing, ui.perfetto.dev)")
+
+tracer = Tracer.from_env()
+
+class TracedConnection(sqlite3.Connection):
+    """
+    Соединение SQLite, каждая операция которого — спан "sqlite".
+    """
+
+    def execute(self, sql, *args):
+        with tracer.span(sql.split(None, 1)[0].upper(), "sqlite", sql=sql[:120]):
+            return super().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        with tracer.span(sql.split(None, 1)[0].upper(), "sqlite", sql=sql[:120]):
+            return super().executemany(sql, *args)
+
+    def executescript(self, script):
+        with tracer.span("SCRIPT", "sqlite"):
+            return super().executescript(script)
+
+    def commit(self):
+        with tracer.span("COMMIT", "sqlite"):
+            return super().commit()
+
+def connect_db(path):
+    if tracer.enabled:
+        return sqlite3.connect(path, check_same_thread=False, factory=TracedConnection)
+    return sqlite3.connect(path, check_same_thread=False)
+
+DB_POOL_SIZE = 4
+
+class ConnectionPool:
+    """
+    До size соединений с одной базой в режиме WAL. Читатели из разных сессий
+    берут свободное соединение и не ждут друг друга; соединения создаются
+    по мере надобности, так что в однопользовательском режиме оно одно.
+    """
+
+    def __init__(self, path, size=DB_POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        with self.connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+
+    def _connect(self):
+        conn = connect_db(self.path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Писатель один, но checkpoint WAL может ненадолго занять базу
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            conn = self._connect() if create else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+TRANSLATION_CACHE_SIZE = 5000
+TRANSLATE_BATCH_LIMIT = 4500
+TRANSLATE_WORKERS = 8
+
+def normalize_text(text):
+    # Ключ кэша не должен зависеть от лишних пробелов и переводов строк Windows
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n")
+    return "\n".join(" ".join(line.split()) for line in text.strip().split("\n"))
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[\"'«(]?[A-ZА-ЯЁ0-9])")
+STEP_LABEL = re.compile(r"^(?:step\s*)?\d+[.)]?$", re.IGNORECASE)
+# Сокращения, которыми предложение не заканчивается: "approx. 5 mins." — одно предложение.
+# Единицы вроде "1 hr." сюда не входят: перед заглавной буквой это почти всегда конец фразы
+ABBREVIATION = re.compile(r"(?:^|[\s(])(?:approx|e\.g|i\.e|mr|mrs|ms|dr|vs)\.$", re.IGNORECASE)
+# "No." — сокращение, только если дальше номер: "Gas Mark No. 4"
+NUMBER_SIGN = re.compile(r"(?:^|[\s(])no\.$", re.IGNORECASE)
+
+def split_long(sentence, limit=TRANSLATE_BATCH_LIMIT):
+    if len(sentence) <= limit:
+        return [sentence]
+    parts = [""]
+    for word in sentence.split():
+        if parts[-1] and len(parts[-1]) + len(word) + 1 > limit:
+            parts.append("")
+        parts[-1] = f"{parts[-1]} {word}" if parts[-1] else word
+    return parts
+
+def split_sentences(text):
+    """
+    Делит текст на абзацы (по строкам), абзацы — на предложения не длиннее
+    TRANSLATE_BATCH_LIMIT. Номер шага вроде "1." и сокращения вроде "approx." остаются
+    с текстом после них.
+    """
+    if not text or not text.strip():
+        return []
+    paragraphs = []
+    for line in normalize_text(text).split("\n"):
+        sentences = []
+        for piece in SENTENCE_END.split(line) if line else []:
+            if sentences and (
+                STEP_LABEL.match(sentences[-1])
+                or ABBREVIATION.search(sentences[-1])
+                or (NUMBER_SIGN.search(sentences[-1]) and piece[:1].isdigit())
+            ):
+                sentences[-1] = f"{sentences[-1]} {piece}"
+            else:
+                sentences.append(piece)
+        paragraphs.append([part for sentence in sentences for part in split_long(sentence)])
+    return paragraphs
+
+def join_sentences(paragraphs, translated):
+    translated = iter(translated)
+    return "\n".join(" ".join(next(translated) for _ in sentences) for sentences in paragraphs)
+
+class TranslationCache:
+    """
+    Память переводов: LRU в памяти поверх таблицы translations в SQLite.
+    _lock защищает только LRU; с диском работают через пул соединений в WAL.
+    """
+
+    def __init__(self, db_path="cache.db", max_size=TRANSLATION_CACHE_SIZE, pool_size=DB_POOL_SIZE):
+        self.max_size = max_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pool = ConnectionPool(db_path, pool_size)
+        with self._pool.connection() as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS translations (
+                    source     TEXT,
+                    target     TEXT,
+                    text       TEXT,
+                    translated TEXT,
+                    PRIMARY KEY (source, target, text)
+                )
+                """
+            )
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, source, target, text):
+        key = (source, target, normalize_text(text))
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "SELECT translated FROM translations WHERE source = ? AND target = ? AND text = ?",
+                key,
+            ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, row[0])
+            return row[0]
+
+    def put(self, source, target, text, translated):
+        self.put_many(source, target, [(text, translated)])
+
+    def put_many(self, source, target, pairs):
+        # Одна транзакция на пачку: холодный рецепт — это десятки строк
+        rows = [(source, target, normalize_text(text), translated) for text, translated in pairs]
+        with self._lock:
+            for *key, translated in rows:
+                self._remember(tuple(key), translated)
+        with self._write_lock, self._pool.connection() as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO translations (source, target, text, translated) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._memory),
+                "max_size": self.max_size,
+            }
+
+TRANSLATORS_ENV = "CULINARY_TRANSLATORS"
+TRANSLATORS_DEFAULT = "google,mymemory"
+MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+MYMEMORY_TIMEOUT = (3.05, 10)
+MYMEMORY_MAX_BYTES = 500
+BACKEND_LATENCY_WINDOW = 100
+BACKEND_DEFAULT_P95 = 1.5
+BACKEND_MIN_SAMPLES = 5
+BREAKER_FAILURES = 3
+BREAKER_COOLDOWN = 30
+# Дольше этого перевод одной строки не ждём ни от одного переводчика:
+# у GoogleTranslator из deep_translator своего таймаута нет
+TRANSLATE_DEADLINE = 10
+BACKEND_MAX_INFLIGHT = TRANSLATE_WORKERS
+
+class Untranslated(str):
+    """
+    Текст, который вернул запасной переводчик без изменений:
+    показывать можно, класть в кэш переводов — нет.
+    """
+
+class GoogleBackend:
+    name = "google"
+    max_bytes = None
+
+    def __init__(self, source, target):
+        from deep_translator import GoogleTranslator
+
+        self._translator = GoogleTranslator(source=source, target=target)
+
+    def translate(self, text):
+        return self._translator.translate(text)
+
+class MyMemoryBackend:
+    name = "mymemory"
+    max_bytes = MYMEMORY_MAX_BYTES
+
+    def __init__(self, source, target):
+        self.langpair = f"{source}|{target}"
+
+    def translate(self, text):
+        response = requests.get(
+            MYMEMORY_URL, params={"q": text, "langpair": self.langpair}, timeout=MYMEMORY_TIMEOUT
+        )
+        response.raise_for_status()
+        data = response.json()
+        # Об исчерпанной квоте и слишком длинном запросе MyMemory сообщает в теле ответа
+        if data.get("responseStatus") != 200:
+            raise RuntimeError(f"MyMemory: {data.get('responseDetails')}")
+        return data["responseData"]["translatedText"]
+
+class IdentityBackend:
+    name = "identity"
+    max_bytes = None
+
+    def __init__(self, source=None, target=None):
+        pass
+
+    def translate(self, text):
+        return Untranslated(text)
+
+TRANSLATION_BACKENDS = {
+    "google": GoogleBackend,
+    "mymemory": MyMemoryBackend,
+    "identity": IdentityBackend,
+}
+
+class BackendHealth:
+    """
+    Задержки последних запросов к переводчику и автомат-предохранитель:
+    после BREAKER_FAILURES ошибок подряд переводчик выключается на
+    BREAKER_COOLDOWN секунд, потом пропускается один пробный запрос.
+    Ошибкой считается и запрос, не уложившийся в p95 или в TRANSLATE_DEADLINE:
+    зависший переводчик иначе никогда бы не выключился.
+    """
+
+    def __init__(self):
+        self.latencies = deque(maxlen=BACKEND_LATENCY_WINDOW)
+        self.calls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.inflight = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+        # Больше BACKEND_MAX_INFLIGHT запросов к одному переводчику не отправляем: лишние ждут слот
+        self._slots = threading.BoundedSemaphore(BACKEND_MAX_INFLIGHT)
+
+    def acquire(self, timeout):
+        if not self._slots.acquire(timeout=max(0, timeout)):
+            return False
+        with self._lock:
+            self.inflight += 1
+        return True
+
+    def release(self):
+        with self._lock:
+            self.inflight -= 1
+        self._slots.release()
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.probing or time.monotonic() - self.opened_at < BREAKER_COOLDOWN:
+                return False
+            self.probing = True
+            return True
+
+    def begin(self):
+        with self._lock:
+            self.calls += 1
+
+    def _fail(self):
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.probing = False
+        if self.opened_at is not None or self.consecutive_failures >= BREAKER_FAILURES:
+            self.opened_at = time.monotonic()
+
+    def miss(self):
+        with self._lock:
+            self._fail()
+
+    def finish(self, seconds, ok, missed=False):
+        with self._lock:
+            self.latencies.append(seconds)
+            if missed:
+                # Ошибка уже засчитана в miss(); поздний ответ только уточняет задержки
+                return
+            if ok:
+                self.consecutive_failures = 0
+                self.opened_at = None
+                self.probing = False
+            else:
+                self._fail()
+
+    def typical(self):
+        with self._lock:
+            ordered = sorted(self.latencies)
+            return ordered[len(ordered) // 2] if ordered else 0.0
+
+    def p95(self):
+        with self._lock:
+            if len(self.latencies) < BACKEND_MIN_SAMPLES:
+                return BACKEND_DEFAULT_P95
+            ordered = sorted(self.latencies)
+            return ordered[int(len(ordered) * 0.95) - 1]
+
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self.probing else "open"
+
+class TranslationRouter:
+    """
+    Выбирает переводчик с наименьшей медианной задержкой. Если ответ
+    не пришёл за его p95, тот же текст параллельно отправляется следующему
+    переводчику и берётся первый успешный ответ. Когда рабочих переводчиков
+    не осталось или за TRANSLATE_DEADLINE никто не ответил, текст
+    возвращается как есть (Untranslated). Сверх BACKEND_MAX_INFLIGHT запросов
+    к переводчику новые ждут свободный слот, но не дольше TRANSLATE_DEADLINE.
+    """
+
+    def __init__(self, backends, fallback=None):
+        self.backends = list(backends)
+        self.fallback = fallback or IdentityBackend()
+        self.health = {backend.name: BackendHealth() for backend in self.backends}
+        self.hedges = 0
+        self._missed = set()
+        self._holding = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, source, target):
+        names = os.environ.get(TRANSLATORS_ENV, TRANSLATORS_DEFAULT).split(",")
+        return cls([TRANSLATION_BACKENDS[name.strip()](source, target) for name in names if name.strip()])
+
+    def batch_bytes(self):
+        # Пачка, которую примет только один переводчик, не может получить повторный запрос
+        limits = [backend.max_bytes for backend in self.backends if backend.max_bytes is not None]
+        return min(limits) if len(self.backends) > 1 and limits else None
+
+    def _candidates(self, text):
+        size = len(text.encode("utf-8"))
+        fits = [b for b in self.backends if b.max_bytes is None or size <= b.max_bytes]
+        # sorted устойчива: пока задержки не измерены, порядок — как в настройке
+        return sorted(fits, key=lambda b: self.health[b.name].typical())
+
+    def _launch(self, candidates, running, text, deadline=None):
+        """
+        Запускает первый свободный переводчик из candidates. Если все заняты и задан
+        deadline, ждёт слот у лучшего из них до deadline; повторный запрос (без deadline)
+        не ждёт — занятые переводчики для него пропускаются.
+        """
+        busy = []
+        while candidates:
+            backend = candidates.pop(0)
+            health = self.health[backend.name]
+            if not health.acquire(0):
+                busy.append(backend)
+                continue
+            future = self._start(backend, health, running, text)
+            if future is not None:
+                return future
+        if deadline is not None and busy:
+            backend = busy.pop(0)
+            candidates.extend(busy)
+            health = self.health[backend.name]
+            if health.acquire(deadline - time.monotonic()):
+                return self._start(backend, health, running, text)
+        return None
+
+    def _start(self, backend, health, running, text):
+        # Предохранитель спрашивается только перед запуском: пробный запрос после паузы
+        # не должен «заниматься» переводчиком, до которого очередь так и не дошла
+        if not health.allow():
+            health.release()
+            return None
+        health.begin()
+        future = Future()
+        with self._lock:
+            self._holding.add(future)
+        # Отдельный daemon-поток на запрос, а не пул: повторный запрос не ждёт
+        # в очереди за зависшими, а зависший поток не держит выход из программы
+        threading.Thread(
+            target=lambda: future.set_result(self._call(backend, text)),
+            name=f"translate-{backend.name}",
+            daemon=True,
+        ).start()
+        future.add_done_callback(lambda f, health=health: self._finished(health, f))
+        running[future] = backend
+        return future
+
+    def _release(self, future, health):
+        # Слот освобождается один раз: по ответу или когда запрос брошен после TRANSLATE_DEADLINE.
+        # Брошенные потоки не копятся — после BREAKER_FAILURES промахов предохранитель их не пускает
+        with self._lock:
+            if future not in self._holding:
+                return
+            self._holding.discard(future)
+        health.release()
+
+    def _call(self, backend, text):
+        started = time.perf_counter()
+        try:
+            with tracer.span(backend.name, "translation", bytes=len(text.encode("utf-8"))):
+                return backend.translate(text), time.perf_counter() - started
+        except Exception:
+            return None, time.perf_counter() - started
+
+    def _finished(self, health, future):
+        with self._lock:
+            missed = future in self._missed
+            self._missed.discard(future)
+        translated, seconds = future.result()
+        self._release(future, health)
+        health.finish(seconds, bool(translated), missed)
+
+    def _miss(self, future, backend):
+        with self._lock:
+            if future.done() or future in self._missed:
+                return
+            self._missed.add(future)
+        self.health[backend.name].miss()
+
+    def translate(self, text):
+        deadline = time.monotonic() + TRANSLATE_DEADLINE
+        candidates = self._candidates(text)
+        running = {}
+        last = self._launch(candidates, running, text, deadline)
+        last_started = time.monotonic()
+        while running:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            timeout = deadline - now
+            if candidates and last in running:
+                timeout = min(timeout, max(0, last_started + self.health[running[last].name].p95() - now))
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                if candidates and last in running:
+                    self._miss(last, running[last])
+                    hedge = self._launch(candidates, running, text)
+                    if hedge is not None:
+                        self.hedges += 1
+                        last, last_started = hedge, time.monotonic()
+                continue
+            for future in done:
+                running.pop(future)
+                translated, _ = future.result()
+                if translated:
+                    return translated
+            if not running:
+                last = self._launch(candidates, running, text, deadline)
+                last_started = time.monotonic()
+        for future, backend in running.items():
+            self._miss(future, backend)
+            self._release(future, self.health[backend.name])
+        return self.fallback.translate(text)
+
+    def stats(self):
+        return {
+            "hedges": self.hedges,
+            "backends": {
+                name: {
+                    "calls": health.calls,
+                    "failures": health.failures,
+                    "inflight": health.inflight,
+                    "median_ms": round(health.typical() * 1000, 1),
+                    "p95_ms": round(health.p95() * 1000, 1),
+                    "breaker": health.state(),
+                }
+                for name, health in self.health.items()
+            },
+        }
+
+class CachedTranslator:
+    """
+    Обёртка над TranslationRouter: в сеть уходят только строки, которых нет в кэше.
+    """
+
+    def __init__(self, source, target, cache):
+        self.source = source
+        self.target = target
+        self.cache = cache
+        self._backend = None
+
+    @property
+    def _translator(self):
+        if self._backend is None:
+            self._backend = TranslationRouter.from_env(self.source, self.target)
+        return self._backend
+
+    def translate(self, text):
+        if not text or not text.strip():
+            return text or ""
+        cached = self.cache.get(self.source, self.target, text)
+        if cached is not None:
+            return cached
+        return self._translate_uncached(text)
+
+    def _translate_uncached(self, text):
+        with tracer.span("translate", "translation", bytes=len(text.encode("utf-8"))):
+            translated = self._translator.translate(text)
+        if translated is not None and not isinstance(translated, Untranslated):
+            self.cache.put(self.source, self.target, text, translated)
+        return translated
+
+    def translate_batch(self, texts):
+        """
+        Переводит список строк за минимальное число запросов.
+        Однострочные тексты склеиваются через перевод строки в пачки до
+        TRANSLATE_BATCH_LIMIT символов, а при нескольких переводчиках — не больше,
+        чем принимает самый строгий из них; если переводчик вернул другое число строк,
+        пачка переводится по одной строке. Непереведённые строки возвращаются
+        как Untranslated.
+        """
+        results = [text or "" for text in texts]
+        pending = {}
+        for index, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            cached = self.cache.get(self.source, self.target, text)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.setdefault(normalize_text(text), []).append(index)
+
+        # Пачки по размеру самого строгого переводчика: иначе длинный рецепт уходит
+        # только в Google и повторный запрос при задержке ему не достаётся
+        hedge_bytes = self._translator.batch_bytes()
+        if hedge_bytes is None:
+            limit, size = TRANSLATE_BATCH_LIMIT, len
+        else:
+            limit, size = min(TRANSLATE_BATCH_LIMIT, hedge_bytes), lambda text: len(text.encode("utf-8"))
+
+        chunks = []
+        current = []
+        current_len = 0
+        for text in pending:
+            if "\n" in text or size(text) > limit:
+                chunks.append([text])
+                continue
+            if current and current_len + size(text) + 1 > limit:
+                chunks.append(current)
+                current = []
+                current_len = 0
+            current.append(text)
+            current_len += size(text) + 1
+        if current:
+            chunks.append(current)
+
+        def translate_chunk(chunk):
+            if len(chunk) == 1:
+                return [self._translate_uncached(chunk[0])]
+            batch_text = "\n".join(chunk)
+            with tracer.span("translate batch", "translation", bytes=len(batch_text.encode("utf-8")), items=len(chunk)):
+                joined = self._translator.translate(batch_text) or ""
+            translated = [line.strip() for line in joined.split("\n")]
+            if isinstance(joined, Untranslated):
+                # Переводчики недоступны: показываем оригинал, но в кэш его не пишем
+                return [Untranslated(text) for text in chunk]
+            if len(translated) != len(chunk) or not all(translated):
+                return [self._translate_uncached(text) for text in chunk]
+            self.cache.put_many(self.source, self.target, zip(chunk, translated))
+            return translated
+
+        # Пачки независимы, так что длинный текст, разбитый на несколько пачек, переводится параллельно
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(TRANSLATE_WORKERS, len(chunks))) as pool:
+                translated_chunks = list(pool.map(translate_chunk, chunks))
+        else:
+            translated_chunks = [translate_chunk(chunk) for chunk in chunks]
+
+        for chunk, translated in zip(chunks, translated_chunks):
+            for text, value in zip(chunk, translated):
+                for index in pending[text]:
+                    results[index] = value
+        return results
+
+    def translate_parallel(self, texts, max_workers=TRANSLATE_WORKERS):
+        """
+        Переводит строки параллельно, не более max_workers запросов одновременно.
+        Порядок сохраняется; при ошибке для строки остаётся исходный текст.
+        """
+
+        def translate_one(text):
+            try:
+                return self.translate(text) or text
+            except Exception:
+                return text
+
+        texts = list(texts)
+        if len(texts) < 2:
+            return [translate_one(text) for text in texts]
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(texts)))) as pool:
+            return list(pool.map(translate_one, texts))
+
+translation_cache = Lazy(lambda: TranslationCache("cache.db"))
+translator_ru_en = CachedTranslator("ru", "en", translation_cache)
+translator_en_ru = CachedTranslator("en", "ru", translation_cache)
+
+MEALDB_ORIGIN = "https://www.themealdb.com"
+MEALDB_BASE_URL = MEALDB_ORIGIN + "/api/json/v1/1"
+MEALDB_CATEGORY_IMAGE = MEALDB_ORIGIN + "/images/category/{}.png"
+# (таймаут соединения, таймаут чтения) в секундах
+MEALDB_TIMEOUTS = {
+    "filter.php": (3.05, 10),
+    "lookup.php": (3.05, 10),
+    "search.php": (3.05, 15),
+    "list.php": (3.05, 15),
+    "categories.php": (3.05, 10),
+}
+MEALDB_DEFAULT_TIMEOUT = (3.05, 10)
+MEALDB_RETRIES = 3
+MEALDB_BACKOFF = 0.5
+MEALDB_BACKOFF_MAX = 8
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Сколько секунд ответ считается свежим; после этого он перепроверяется,
+# а без сети отдаётся устаревшая копия
+MEALDB_CACHE_TTL = {
+    "filter.php": 24 * 3600,
+    "lookup.php": 7 * 24 * 3600,
+    "search.php": 24 * 3600,
+    "list.php": 7 * 24 * 3600,
+    "categories.php": 7 * 24 * 3600,
+}
+MEALDB_DEFAULT_CACHE_TTL = 24 * 3600
+
+class ResponseCache:
+    """
+    Дисковый кэш JSON-ответов TheMealDB (таблица http_cache).
+    Читается через пул соединений, запись — по одной под блокировкой.
+    """
+
+    def __init__(self, db_path="cache.db", pool_size=DB_POOL_SIZE):
+        self._lock = threading.Lock()
+        self._pool = ConnectionPool(db_path, pool_size)
+        with self._pool.connection() as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    key           TEXT PRIMARY KEY,
+                    body          TEXT,
+                    etag          TEXT,
+                    last_modified TEXT,
+                    fetched_at    REAL
+                )
+                """
+            )
+
+    @staticmethod
+    def make_key(endpoint, params):
+        return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+    def get(self, key):
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM http_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, fetched_at = row
+        return {
+            "data": json.loads(body),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": fetched_at,
+        }
+
+    def put(self, key, data, etag=None, last_modified=None):
+        with self._lock, self._pool.connection() as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO http_cache (key, body, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(data, ensure_ascii=False), etag, last_modified, time.time()),
+            )
+
+    def touch(self, key):
+        with self._lock, self._pool.connection() as conn, conn:
+            conn.execute(
+                "UPDATE http_cache SET fetched_at = ? WHERE key = ?", (time.time(), key)
+            )
+
+class MealDBClient:
+    """
+    Клиент TheMealDB: одна сессия с пулом keep-alive соединений,
+    таймауты по эндпоинтам и повторы с экспоненциальной задержкой и джиттером.
+    """
+
+    def __init__(
+        self,
+        base_url=MEALDB_BASE_URL,
+        timeouts=None,
+        retries=MEALDB_RETRIES,
+        backoff=MEALDB_BACKOFF,
+        cache=None,
+        cache_ttl=None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeouts = dict(MEALDB_TIMEOUTS, **(timeouts or {}))
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = cache
+        self.cache_ttl = dict(MEALDB_CACHE_TTL, **(cache_ttl or {}))
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._session_lock:
+            if self._session is None:
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=16)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["Connection"] = "keep-alive"
+                self._session = session
+            return self._session
+
+    def retry_delay(self, attempt):
+        # "Full jitter": случайная пауза от 0 до backoff * 2^attempt
+        return random.uniform(0, min(MEALDB_BACKOFF_MAX, self.backoff * 2**attempt))
+
+    def _sleep_before_retry(self, attempt):
+        time.sleep(self.retry_delay(attempt))
+
+    def _request(self, endpoint, params, headers=None):
+        url = f"{self.base_url}/{endpoint}"
+        timeout = self.timeouts.get(endpoint, MEALDB_DEFAULT_TIMEOUT)
+        for attempt in range(self.retries + 1):
+            try:
+                with tracer.span(endpoint, "network", params=params, attempt=attempt) as span_args:
+                    response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+                    span_args["status"] = response.status_code
+                    span_args["bytes"] = len(response.content)
+                if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                    self._sleep_before_retry(attempt)
+                    continue
+                response.raise_for_status()
+                return response
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                self._sleep_before_retry(attempt)
+
+    def cache_lookup(self, endpoint, params):
+        """
+        Возвращает (ключ, запись кэша, заголовки для перепроверки).
+        Заголовки None, если запись ещё свежая и в сеть идти не нужно.
+        Общая часть get() синхронного и асинхронного клиентов.
+        """
+        key = ResponseCache.make_key(endpoint, params)
+        entry = self.cache.get(key)
+        ttl = self.cache_ttl.get(endpoint, MEALDB_DEFAULT_CACHE_TTL)
+        if entry is not None and time.time() - entry["fetched_at"] < ttl:
+            return key, entry, None
+
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return key, entry, headers
+
+    def cache_update(self, key, entry, status_code, headers, load_json):
+        # 304: данные не изменились, продлеваем срок старой записи
+        if status_code == 304 and entry is not None:
+            self.cache.touch(key)
+            return entry["data"]
+        data = load_json()
+        self.cache.put(key, data, headers.get("ETag"), headers.get("Last-Modified"))
+        return data
+
+    def get(self, endpoint, **params):
+        if self.cache is None:
+            return self._request(endpoint, params).json()
+
+        key, entry, headers = self.cache_lookup(endpoint, params)
+        if headers is None:
+            return entry["data"]
+        try:
+            response = self._request(endpoint, params, headers)
+            return self.cache_update(key, entry, response.status_code, response.headers, response.json)
+        except (requests.RequestException, ValueError):
+            # Нет сети или сервер отдал мусор: лучше устаревший ответ, чем никакого
+            if entry is not None:
+                return entry["data"]
+            raise
+
+    def filter_by_category(self, category):
+        return self.get("filter.php", c=category).get("meals") or []
+
+    def filter_by_ingredient(self, ingredient):
+        return self.get("filter.php", i=ingredient).get("meals") or []
+
+    def lookup(self, meal_id):
+        meals = self.get("lookup.php", i=meal_id).get("meals") or []
+        return meals[0] if meals else None
+
+    def search_by_letter(self, letter):
+        return self.get("search.php", f=letter).get("meals") or []
+
+    def list_categories(self):
+        return self.get("categories.php").get("categories") or []
+
+    def list_areas(self):
+        return [a["strArea"] for a in self.get("list.php", a="list").get("meals") or []]
+
+    def list_ingredients(self):
+        return self.get("list.php", i="list").get("meals") or []
+
+mealdb = Lazy(lambda: MealDBClient(cache=ResponseCache("cache.db")))
+
+class AsyncMealDBClient:
+    """
+    Асинхронный клиент TheMealDB на httpx (приходит вместе с flet).
+    Таймауты, повторы и дисковый кэш — те же, что у синхронного клиента.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._http = None
+
+    def _session(self):
+        if self._http is None:
+            import httpx
+
+            self._http = httpx.AsyncClient(
+                base_url=self.client.base_url,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+            )
+        return self._http
+
+    async def _request(self, endpoint, params, headers=None):
+        import httpx
+
+        connect, read = self.client.timeouts.get(endpoint, MEALDB_DEFAULT_TIMEOUT)
+        timeout = httpx.Timeout(read, connect=connect)
+        for attempt in range(self.client.retries + 1):
+            try:
+                with tracer.span(endpoint, "network", params=params, attempt=attempt, mode="async") as span_args:
+                    response = await self._session().get(
+                        f"/{endpoint}", params=params, headers=headers, timeout=timeout
+                    )
+                    span_args["status"] = response.status_code
+                    span_args["bytes"] = len(response.content)
+                if response.status_code in RETRY_STATUSES and attempt < self.client.retries:
+                    await asyncio.sleep(self.client.retry_delay(attempt))
+                    continue
+                if response.status_code != 304:
+                    response.raise_for_status()
+                return response
+            except httpx.TransportError:
+                if attempt == self.client.retries:
+                    raise
+                await asyncio.sleep(self.client.retry_delay(attempt))
+
+    async def get(self, endpoint, **params):
+        import httpx
+
+        # Кэш — это SQLite (а первое обращение к mealdb его ещё и открывает):
+        # читаем и пишем в потоке, чтобы не держать цикл событий
+        cached = await asyncio.to_thread(
+            lambda: self.client.cache_lookup(endpoint, params) if self.client.cache is not None else None
+        )
+        if cached is None:
+            return (await self._request(endpoint, params)).json()
+        key, entry, headers = cached
+        if headers is None:
+            return entry["data"]
+        try:
+            response = await self._request(endpoint, params, headers)
+            return await asyncio.to_thread(
+                self.client.cache_update, key, entry, response.status_code, response.headers, response.json
+            )
+        except (httpx.HTTPError, ValueError):
+            if entry is not None:
+                return entry["data"]
+            raise
+
+    async def filter_by_category(self, category):
+        return (await self.get("filter.php", c=category)).get("meals") or []
+
+    async def filter_by_ingredient(self, ingredient):
+        return (await self.get("filter.php", i=ingredient)).get("meals") or []
+
+    async def lookup(self, meal_id):
+        meals = (await self.get("lookup.php", i=meal_id)).get("meals") or []
+        return meals[0] if meals else None
+
+async_mealdb = AsyncMealDBClient(mealdb)
+
+# Flet ищет assets_dir от папки скрипта, а не от текущей: один абсолютный путь для кэша и ft.app
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+IMAGE_CACHE_DIR = "img_cache"
+IMAGE_CACHE_MAX_BYTES = 100 * 1024 * 1024
+IMAGE_WORKERS = 4
+# Уменьшенные копии картинок блюд TheMealDB: URL + "/small", "/medium" и т.д.
+IMAGE_VARIANTS = [(250, "/small"), (350, "/medium"), (500, "/large")]
+
+def image_variant(url, width):
+    if not url or "/images/media/meals/" not in url:
+        return url
+    for max_width, suffix in IMAGE_VARIANTS:
+        if width <= max_width:
+            return url + suffix
+    return url
+
+class ImageCache:
+    """
+    Дисковый LRU-кэш картинок в assets/img_cache с ограничением по размеру.
+    Пока картинки нет на диске, ft.Image получает удалённый URL, а файл
+    скачивается в фоне; в следующий раз картинка отдаётся локально.
+    """
+
+    def __init__(self, assets_dir=ASSETS_DIR, subdir=IMAGE_CACHE_DIR, max_bytes=IMAGE_CACHE_MAX_BYTES, session=None):
+        self.subdir = subdir
+        self.dir = os.path.join(assets_dir, subdir)
+        self.max_bytes = max_bytes
+        self._session = session
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._pool = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="images")
+        os.makedirs(self.dir, exist_ok=True)
+        self._files = OrderedDict()
+        entries = []
+        for entry in os.scandir(self.dir):
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+        self.total_bytes = sum(self._files.values())
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def file_name(url):
+        ext = os.path.splitext(url.split("?")[0])[1]
+        if ext not in (".jpg", ".jpeg", ".png", ".webp"):
+            ext = ".jpg"
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()[:20] + ext
+
+    def src(self, url, width):
+        url = image_variant(url, width)
+        if not url:
+            return url
+        name = self.file_name(url)
+        with self._lock:
+            if name in self._files:
+                self._files.move_to_end(name)
+                self.hits += 1
+                path = os.path.join(self.dir, name)
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                return f"/{self.subdir}/{name}"
+            self.misses += 1
+        self.prefetch([(url, None)])
+        return url
+
+    def prefetch(self, items):
+        for url, width in items:
+            if width is not None:
+                url = image_variant(url, width)
+            if not url:
+                continue
+            name = self.file_name(url)
+            with self._lock:
+                if name in self._files or name in self._pending:
+                    continue
+                self._pending.add(name)
+            self._pool.submit(self._download, url, name)
+
+    def _download(self, url, name):
+        try:
+            with tracer.span("image", "network") as span_args:
+                response = (self._session or mealdb.session).get(url, timeout=(3.05, 15))
+                response.raise_for_status()
+                data = response.content
+                span_args["bytes"] = len(data)
+            path = os.path.join(self.dir, name)
+            with open(path + ".part", "wb") as f:
+                f.write(data)
+            os.replace(path + ".part", path)
+            with self._lock:
+                self._files[name] = len(data)
+                self.total_bytes += len(data)
+                self._evict()
+        except (requests.RequestException, OSError):
+            pass
+        finally:
+            with self._lock:
+                self._pending.discard(name)
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self._files) > 1:
+            name, size = self._files.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(os.path.join(self.dir, name))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "files": len(self._files),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+image_cache = Lazy(ImageCache)
+
+def first_frame_image_src(url, width):
+    # Кэш картинок (папка, обход до IMAGE_CACHE_MAX_BYTES файлов, потоки) создаёт warm_up;
+    # до него карточки главного экрана получают удалённый URL
+    if not image_cache.is_loaded():
+        return image_variant(url, width)
+    return image_cache.src(url, width)
+
+CATALOG_DB = "catalog.db"
+
+class Catalog:
+    """
+    Локальная копия всего каталога TheMealDB с русскими полями и FTS5-индексом.
+    Заполняется командой `python начало.py sync`. Запросы сессий идут через
+    ConnectionPool и не ждут друг друга; _lock держат только пишущие.
+    """
+
+    def __init__(self, db_path=CATALOG_DB, pool_size=DB_POOL_SIZE):
+        self._lock = threading.Lock()
+        self._pool = ConnectionPool(db_path, pool_size)
+        with self._pool.connection() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS categories (
+                    name        TEXT PRIMARY KEY,
+                    name_ru     TEXT,
+                    image_url   TEXT,
+                    description TEXT
+                );
+                CREATE TABLE IF NOT EXISTS areas (
+                    name    TEXT PRIMARY KEY,
+                    name_ru TEXT
+                );
+                CREATE TABLE IF NOT EXISTS ingredients (
+                    name        TEXT PRIMARY KEY,
+                    name_ru     TEXT,
+                    description TEXT
+                );
+                CREATE TABLE IF NOT EXISTS meals (
+                    meal_id   TEXT PRIMARY KEY,
+                    title     TEXT,
+                    title_ru  TEXT,
+                    category  TEXT,
+                    area      TEXT,
+                    image_url TEXT,
+                    meal_json TEXT,
+                    recipe_ru TEXT
+                );
+                CREATE INDEX IF NOT EXISTS meals_category ON meals (category);
+                CREATE VIRTUAL TABLE IF NOT EXISTS meals_fts USING fts5 (
+                    meal_id UNINDEXED,
+                    title,
+                    ingredients,
+                    instructions,
+                    tokenize = "unicode61 remove_diacritics 2"
+                );
+                """
+            )
+
+    def meal_count(self):
+        with self._pool.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM meals").fetchone()[0]
+
+    def is_ready(self):
+        return self.meal_count() > 0
+
+    def save_meal(self, meal, recipe):
+        ingredients_en = [
+            meal.get(f"strIngredient{i}") or "" for i in range(1, 21)
+        ]
+        with self._lock, self._pool.connection() as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meals (meal_id, title, title_ru, category, area, image_url, meal_json, recipe_ru) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    meal["idMeal"],
+                    meal["strMeal"],
+                    recipe["title"],
+                    meal.get("strCategory"),
+                    meal.get("strArea"),
+                    meal["strMealThumb"],
+                    json.dumps(meal, ensure_ascii=False),
+                    json.dumps(recipe, ensure_ascii=False),
+                ),
+            )
+            conn.execute("DELETE FROM meals_fts WHERE meal_id = ?", (meal["idMeal"],))
+            conn.execute(
+                "INSERT INTO meals_fts (meal_id, title, ingredients, instructions) VALUES (?, ?, ?, ?)",
+                (
+                    meal["idMeal"],
+                    f"{meal['strMeal']} {recipe['title']}",
+                    " ".join(ingredients_en + recipe["ingredients"]),
+                    f"{meal.get('strInstructions') or ''} {recipe['instructions']}",
+                ),
+            )
+
+    def _rows_to_meals(self, rows):
+        return [
+            {"idMeal": meal_id, "strMeal": title, "strMealRu": title_ru, "strMealThumb": image_url}
+            for meal_id, title, title_ru, image_url in rows
+        ]
+
+    def meals_by_category(self, category):
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT meal_id, title, title_ru, image_url FROM meals WHERE category = ? ORDER BY title",
+                (category,),
+            ).fetchall()
+        return self._rows_to_meals(rows)
+
+    def search(self, query, limit=100):
+        words = [w for w in "".join(c if c.isalnum() else " " for c in query).split() if w]
+        if not words:
+            return []
+        # Каждое слово — префиксный запрос; сначала все слова сразу, потом хотя бы одно
+        terms = [f'"{w}"*' for w in words]
+        for match in (" AND ".join(terms), " OR ".join(terms)):
+            with self._pool.connection() as conn:
+                rows = conn.execute(
+                    "SELECT m.meal_id, m.title, m.title_ru, m.image_url "
+                    "FROM meals_fts f JOIN meals m ON m.meal_id = f.meal_id "
+                    "WHERE meals_fts MATCH ? ORDER BY bm25(meals_fts, 0, 10.0, 5.0, 1.0) LIMIT ?",
+                    (match, limit),
+                ).fetchall()
+            if rows:
+                return self._rows_to_meals(rows)
+        return []
+
+    def recipe(self, meal_id):
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "SELECT recipe_ru FROM meals WHERE meal_id = ?", (meal_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_meals(self):
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT meal_id, title, title_ru, image_url, meal_json FROM meals"
+            ).fetchall()
+        for meal_id, title, title_ru, image_url, meal_json in rows:
+            yield {"idMeal": meal_id, "strMeal": title, "strMealRu": title_ru, "strMealThumb": image_url}, json.loads(meal_json)
+
+    def category_ru(self, category):
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                "SELECT name_ru FROM categories WHERE name = ?", (category,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def save_ingredients(self, ingredients, translator):
+        ingredients_ru = translator.translate_batch([i["strIngredient"] for i in ingredients])
+        with self._lock, self._pool.connection() as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ingredients (name, name_ru, description) VALUES (?, ?, ?)",
+                [
+                    (i["strIngredient"], name_ru, i.get("strDescription"))
+                    for i, name_ru in zip(ingredients, ingredients_ru)
+                ],
+            )
+
+    def ingredient_names(self):
+        with self._pool.connection() as conn:
+            return conn.execute("SELECT name, name_ru FROM ingredients").fetchall()
+
+    def meal_titles(self):
+        with self._pool.connection() as conn:
+            return conn.execute("SELECT meal_id, title, title_ru FROM meals").fetchall()
+
+    def sync(self, client, translator, log=print):
+        categories = client.list_categories()
+        names_ru = translator.translate_batch([c["strCategory"] for c in categories])
+        with self._lock, self._pool.connection() as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO categories (name, name_ru, image_url, description) VALUES (?, ?, ?, ?)",
+                [
+                    (c["strCategory"], name_ru, c["strCategoryThumb"], c.get("strCategoryDescription"))
+                    for c, name_ru in zip(categories, names_ru)
+                ],
+            )
+        log(f"Категорий: {len(categories)}")
+
+        areas = client.list_areas()
+        areas_ru = translator.translate_batch(areas)
+        with self._lock, self._pool.connection() as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO areas (name, name_ru) VALUES (?, ?)",
+                list(zip(areas, areas_ru)),
+            )
+        log(f"Кухонь: {len(areas)}")
+
+        ingredients = client.list_ingredients()
+        self.save_ingredients(ingredients, translator)
+        log(f"Ингредиентов: {len(ingredients)}")
+
+        meals = []
+        for letter in string.ascii_lowercase + string.digits:
+            meals.extend(client.search_by_letter(letter))
+        log(f"Рецептов: {len(meals)}, перевожу...")
+
+        def store(meal):
+            recipe = translate_recipe(meal)
+            # Непереведённый рецепт в каталог не пишем: его возьмёт следующая синхронизация
+            if is_untranslated(recipe):
+                return False
+            self.save_meal(meal, recipe)
+            return True
+
+        skipped = 0
+        with ThreadPoolExecutor(max_workers=TRANSLATE_WORKERS) as pool:
+            for done, stored in enumerate(pool.map(store, meals), 1):
+                skipped += not stored
+                if done % 50 == 0 or done == len(meals):
+                    log(f"  {done}/{len(meals)}")
+        if skipped:
+            log(f"Не переведено, пропущено: {skipped}")
+
+        with self._lock, self._pool.connection() as conn, conn:
+            conn.execute("INSERT INTO meals_fts (meals_fts) VALUES ('optimize')")
+        ingredient_index.build(self)
+        suggest_index.rebuild(self)
+
+catalog = Lazy(lambda: Catalog(CATALOG_DB))
+
+def ingredient_words(name):
+    return [w for w in "".join(c if c.isalnum() else " " for c in name.lower()).split() if w]
+
+class IngredientIndex:
+    """
+    Обратный индекс «ингредиент -> id рецептов» по strIngredient1..20 каталога.
+    Строится в памяти один раз, поиск — пересечение множеств без обращения к SQLite.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._names_by_word = {}
+        self._meals = {}
+        self.ready = False
+
+    def build(self, catalog):
+        postings = {}
+        names_by_word = {}
+        meals = {}
+        for card, meal in catalog.iter_meals():
+            meals[card["idMeal"]] = card
+            for i in range(1, 21):
+                name = (meal.get(f"strIngredient{i}") or "").strip().lower()
+                if not name:
+                    continue
+                postings.setdefault(name, set()).add(card["idMeal"])
+                for word in ingredient_words(name):
+                    names_by_word.setdefault(word, set()).add(name)
+        with self._lock:
+            self._postings = postings
+            self._names_by_word = names_by_word
+            self._meals = meals
+            self.ready = bool(meals)
+
+    def meal_ids(self, ingredient_en):
+        name = ingredient_en.strip().lower()
+        result = set(self._postings.get(name, ()))
+        # "chicken" совпадает и с "chicken breast", "chicken thighs" и т.д., даже когда
+        # в каталоге есть ингредиент "chicken" ровно с таким названием
+        words = ingredient_words(name)
+        if not words:
+            return result
+        names = set.intersection(*(self._names_by_word.get(w, set()) for w in words))
+        for n in names:
+            result |= self._postings[n]
+        return result
+
+    def match(self, ingredients_en, limit=100):
+        with self._lock:
+            coverage = Counter()
+            for ingredient in ingredients_en:
+                coverage.update(self.meal_ids(ingredient))
+            ranked = sorted(
+                coverage.items(),
+                key=lambda item: (-item[1], self._meals[item[0]]["strMeal"]),
+            )[:limit]
+            return [dict(self._meals[meal_id], matched=count) for meal_id, count in ranked]
+
+ingredient_index = IngredientIndex()
+
+def rank_by_coverage(meal_lists, limit=100):
+    # Тот же ранжир по числу совпавших ингредиентов, но для ответов filter.php
+    coverage = Counter()
+    cards = {}
+    for meals in meal_lists:
+        for m in meals:
+            coverage[m["idMeal"]] += 1
+            cards[m["idMeal"]] = m
+    ranked = sorted(coverage.items(), key=lambda item: (-item[1], cards[item[0]]["strMeal"]))[:limit]
+    return [dict(cards[meal_id], matched=count) for meal_id, count in ranked]
+
+def split_ingredients(query):
+    return [part.strip() for part in query.replace(";", ",").split(",") if part.strip()]
+
+# Окончания падежей и множественного числа, самые длинные — первыми
+RU_ENDINGS = sorted(
+    [
+        "иями", "ями", "ами", "ого", "его", "ому", "ему", "ыми", "ими", "ах", "ях",
+        "ам", "ям", "ом", "ем", "ой", "ей", "ий", "ый", "ая", "яя", "ое", "ее",
+        "ые", "ие", "ов", "ев", "ую", "юю", "а", "я", "ы", "и", "у", "ю",
+        "е", "о", "ь", "й",
+    ],
+    key=len,
+    reverse=True,
+)
+
+def ru_stem(word):
+    word = word.lower().replace("ё", "е")
+    for ending in RU_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= 3:
+            return word[: -len(ending)]
+    return word
+
+# После неудачной загрузки словаря (нет сети и кэша list.php) повтор не раньше чем через столько секунд
+LEXICON_RETRY_COOLDOWN = 60
+
+def lexicon_key(text):
+    return " ".join(ru_stem(w) for w in ingredient_words(text))
+
+class IngredientLexicon:
+    """
+    Словарь ru<->en названий ингредиентов TheMealDB (list.php?i=list).
+    Русские формы приводятся к основе, так что "курицу", "курицы" и "курица"
+    дают один ключ; опечатки добираются нечётким сравнением.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._ru_to_en = {}
+        self._en = {}
+        self._en_to_ru = {}
+        self.ready = False
+        self.failed_at = None
+
+    def ensure_loaded(self, catalog, client, translator):
+        # Без этого каждый термин каждого поиска заново проходил бы все повторы и паузы MealDBClient
+        with self._load_lock:
+            if self.ready:
+                return
+            if self.failed_at is not None and time.monotonic() - self.failed_at < LEXICON_RETRY_COOLDOWN:
+                return
+            try:
+                self.load(catalog, client, translator)
+            except Exception:
+                self.failed_at = time.monotonic()
+            else:
+                self.failed_at = None
+
+    def load(self, catalog, client, translator):
+        rows = catalog.ingredient_names()
+        if not rows:
+            # Каталог не синхронизирован: один раз тянем список и переводим его
+            catalog.save_ingredients(client.list_ingredients(), translator)
+            rows = catalog.ingredient_names()
+        ru_to_en = {}
+        en = {}
+        en_to_ru = {}
+        for name, name_ru in sorted(rows, key=lambda row: len(row[0])):
+            en.setdefault(name.lower(), name)
+            if name_ru:
+                en_to_ru[name] = name_ru
+                ru_to_en.setdefault(lexicon_key(name_ru), name)
+        with self._lock:
+            self._ru_to_en = ru_to_en
+            self._en = en
+            self._en_to_ru = en_to_ru
+            self.ready = True
+
+    def resolve(self, term):
+        with self._lock:
+            if term.strip().lower() in self._en:
+                return self._en[term.strip().lower()]
+            key = lexicon_key(term)
+            if not key:
+                return None
+            if key in self._ru_to_en:
+                return self._ru_to_en[key]
+            close = get_close_matches(key, self._ru_to_en.keys(), n=1, cutoff=0.8)
+            if close:
+                return self._ru_to_en[close[0]]
+            close = get_close_matches(term.strip().lower(), self._en.keys(), n=1, cutoff=0.85)
+            return self._en[close[0]] if close else None
+
+    def to_ru(self, name_en):
+        with self._lock:
+            return self._en_to_ru.get(name_en)
+
+ingredient_lexicon = IngredientLexicon()
+
+def ingredient_to_en(term):
+    if not ingredient_lexicon.ready:
+        ingredient_lexicon.ensure_loaded(catalog, mealdb, translator_en_ru)
+    # Переводчик — только если словарь не знает такого ингредиента
+    return ingredient_lexicon.resolve(term) or translator_ru_en.translate(term)
+
+SUGGEST_FILE = "suggest.json"
+SUGGEST_LIMIT = 6
+SUGGEST_DEBOUNCE = 0.016
+
+def suggest_key(text):
+    return text.lower().replace("ё", "е")
+
+class PrefixTrie:
+    """
+    Префиксное дерево, в каждом узле которого заранее лежат лучшие
+    SUGGEST_LIMIT подсказок, так что поиск стоит O(длины префикса).
+    """
+
+    def __init__(self, limit=SUGGEST_LIMIT):
+        self.limit = limit
+        self.root = {}
+
+    def insert(self, key, item, rank):
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+            top = node.setdefault("", [])
+            if item not in (entry for _, entry in top):
+                top.append((rank, item))
+                top.sort(key=lambda entry: entry[0])
+                del top[self.limit :]
+
+    def search(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        return [item for _, item in node.get("", [])]
+
+class SuggestIndex:
+    """
+    Подсказки по русским и английским названиям ингредиентов и блюд.
+    Данные хранятся в компактном SUGGEST_FILE и загружаются в память один раз.
+    """
+
+    def __init__(self, path=SUGGEST_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.trie = None
+
+    def _build_trie(self, data):
+        trie = PrefixTrie()
+        for kind, rows in (("ingredient", data["ingredients"]), ("meal", data["meals"])):
+            # Ингредиенты выше блюд, короткие названия выше длинных
+            kind_rank = 0 if kind == "ingredient" else 1
+            for row in rows:
+                label_ru, name_en = row[0] or row[1], row[1]
+                item = (kind, label_ru, name_en, row[2] if kind == "meal" else None)
+                for label in {label_ru, name_en}:
+                    words = suggest_key(label).split()
+                    # Подсказка находится и по началу любого слова: "грудка" -> "куриная грудка"
+                    for i in range(len(words)):
+                        trie.insert(" ".join(words[i:]), item, (kind_rank, i > 0, len(label_ru)))
+        return trie
+
+    def rebuild(self, catalog):
+        data = {
+            "ingredients": [[name_ru, name] for name, name_ru in catalog.ingredient_names()],
+            "meals": [[title_ru, title, meal_id] for meal_id, title, title_ru in catalog.meal_titles()],
+        }
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self.trie = self._build_trie(data)
+
+    def ensure_loaded(self, catalog):
+        with self._lock:
+            if self.trie is not None:
+                return
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.trie = self._build_trie(json.load(f))
+                return
+            except (OSError, ValueError):
+                pass
+        # Файла ещё нет — собираем его из того, что уже лежит локально
+        if catalog.ingredient_names() or catalog.is_ready():
+            self.rebuild(catalog)
+
+    def suggest(self, text):
+        with self._lock:
+            if self.trie is None:
+                return []
+            prefix = " ".join(suggest_key(text).split())
+            return self.trie.search(prefix) if prefix else []
+
+suggest_index = SuggestIndex()
+
+def find_meals(query):
+    terms = split_ingredients(query)
+    if not terms:
+        return []
+    if catalog.is_ready():
+        if not ingredient_index.ready:
+            ingredient_index.build(catalog)
+        meals = ingredient_index.match([ingredient_to_en(t) for t in terms])
+        return meals or catalog.search(query)
+
+    ingredients_en = [ingredient_to_en(t) for t in terms]
+    meal_lists = []
+    for ingredient in ingredients_en:
+        try:
+            meal_lists.append(mealdb.filter_by_ingredient(ingredient))
+        except Exception:
+            pass
+    return rank_by_coverage(meal_lists)
+
+async def find_meals_async(query):
+    if await asyncio.to_thread(lambda: catalog.is_ready()):
+        return await asyncio.to_thread(find_meals, query)
+    terms = split_ingredients(query)
+    ingredients_en = await asyncio.to_thread(lambda: [ingredient_to_en(t) for t in terms])
+    # Все ингредиенты запрашиваются одновременно
+    meal_lists = await asyncio.gather(
+        *(async_mealdb.filter_by_ingredient(i) for i in ingredients_en),
+        return_exceptions=True,
+    )
+    return rank_by_coverage(m for m in meal_lists if not isinstance(m, BaseException))
+
+FAVORITES_DB = "favorites.db"
+# Пользователь настольной версии; в веб-режиме у каждого браузера свой id
+LOCAL_USER = ""
+FAVORITES_FLUSH_DELAY = 0.5
+# Через сколько секунд сохранённый снимок рецепта обновляется в фоне
+FAVORITE_REFRESH_AGE = 30 * 24 * 3600
+# Миграции схемы favorites.db; номер применённой хранится в PRAGMA user_version
+FAVORITES_MIGRATIONS = [
+    [
+        "ALTER TABLE favorites ADD COLUMN recipe_json TEXT",
+        "ALTER TABLE favorites ADD COLUMN saved_at REAL",
+    ],
+    [
+        "ALTER TABLE favorites ADD COLUMN category TEXT NOT NULL DEFAULT ''",
+        "ALTER TABLE favorites ADD COLUMN area TEXT NOT NULL DEFAULT ''",
+        "UPDATE favorites SET category = COALESCE(json_extract(recipe_json, '$.category'), ''), "
+        "area = COALESCE(json_extract(recipe_json, '$.area'), '') WHERE recipe_json IS NOT NULL",
+        # rowid неявно входит в каждый индекс, поэтому (колонка, rowid) — готовый ключ для keyset
+        "CREATE INDEX IF NOT EXISTS favorites_title ON favorites (title)",
+        "CREATE INDEX IF NOT EXISTS favorites_category ON favorites (category)",
+        "CREATE INDEX IF NOT EXISTS favorites_area ON favorites (area)",
+    ],
+    [
+        # Избранное по пользователям; прежние записи достаются локальному пользователю ''.
+        # rowid копируется, чтобы не сбился порядок добавления
+        "CREATE TABLE favorites_v3 ("
+        "user_id TEXT NOT NULL DEFAULT '', meal_id TEXT NOT NULL, title TEXT, image_url TEXT, "
+        "recipe_json TEXT, saved_at REAL, category TEXT NOT NULL DEFAULT '', area TEXT NOT NULL DEFAULT '', "
+        "PRIMARY KEY (user_id, meal_id))",
+        "INSERT INTO favorites_v3 (rowid, meal_id, title, image_url, recipe_json, saved_at, category, area) "
+        "SELECT rowid, meal_id, title, image_url, recipe_json, saved_at, category, area FROM favorites",
+        "DROP TABLE favorites",
+        "ALTER TABLE favorites_v3 RENAME TO favorites",
+        "CREATE INDEX favorites_user ON favorites (user_id)",
+        "CREATE INDEX favorites_title ON favorites (user_id, title)",
+        "CREATE INDEX favorites_category ON favorites (user_id, category)",
+        "CREATE INDEX favorites_area ON favorites (user_id, area)",
+        "CREATE INDEX favorites_meal ON favorites (meal_id)",
+    ],
+]
+FAVORITES_PAGE_SIZE = 30
+FAVORITES_USERS_IN_MEMORY = 1000
+# Ключ сортировки -> (колонка, направление); "added" — порядок добавления
+FAVORITES_SORTS = {
+    "added": ("rowid", "DESC"),
+    "title": ("title", "ASC"),
+    "category": ("category", "ASC"),
+    "area": ("area", "ASC"),
+}
+
+class FavoritesRepository:
+    """
+    Избранное всех пользователей: пул соединений в режиме WAL и множества id
+    в памяти для FAVORITES_USERS_IN_MEMORY недавних пользователей. Клик по сердечку меняет только память,
+    запись в SQLite идёт пачками в фоновом потоке (write-behind), чтение перед
+    запросом дожидается записи. Методы с параметром user работают с избранным
+    одного пользователя; снимки рецептов общие — рецепт у всех один и тот же.
+    """
+
+    def __init__(self, db_path=FAVORITES_DB, flush_delay=FAVORITES_FLUSH_DELAY, pool_size=DB_POOL_SIZE):
+        self.flush_delay = flush_delay
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._pool = ConnectionPool(db_path, pool_size)
+        with self._pool.connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS favorites (
+                    meal_id   TEXT PRIMARY KEY,
+                    title     TEXT,
+                    image_url TEXT
+                )
+                """
+            )
+            conn.commit()
+            self._migrate(conn)
+            # Сколько пользователей сохранили рецепт: размер — число разных рецептов, а не строк
+            self._saved = Counter(
+                dict(conn.execute("SELECT meal_id, COUNT(*) FROM favorites GROUP BY meal_id"))
+            )
+        # LRU id избранного по пользователям: память растёт с числом активных, а не всех когда-либо заходивших
+        self._ids = OrderedDict()
+        self._pending = []
+        self._wakeup = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, name="favorites-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _migrate(self, conn):
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, statements in enumerate(FAVORITES_MIGRATIONS[version:], version + 1):
+            # sqlite3 сам открывает транзакцию только перед DML, а ALTER/CREATE выполнил бы
+            # вне её: без явного BEGIN упавшая миграция оставила бы половину изменений
+            with conn:
+                conn.execute("BEGIN")
+                for sql in statements:
+                    conn.execute(sql)
+                conn.execute(f"PRAGMA user_version = {number}")
+
+    def _user_ids(self, user):
+        with self._lock:
+            ids = self._ids.get(user)
+            if ids is not None:
+                self._ids.move_to_end(user)
+                return ids
+        # Запрос идёт без общей блокировки, чтобы первый вход пользователя не тормозил остальных.
+        # Очередь записи дописывается до чтения: у вытесненного из памяти пользователя
+        # в ней могут быть свежие клики
+        self.flush()
+        with self._pool.connection() as conn:
+            loaded = {row[0] for row in conn.execute("SELECT meal_id FROM favorites WHERE user_id = ?", (user,))}
+        with self._lock:
+            ids = self._ids.setdefault(user, loaded)
+            self._ids.move_to_end(user)
+            while len(self._ids) > FAVORITES_USERS_IN_MEMORY:
+                self._ids.popitem(last=False)
+            return ids
+
+    def for_user(self, user):
+        return UserFavorites(self, user)
+
+    def contains(self, meal_id, user=LOCAL_USER):
+        return meal_id in self._user_ids(user)
+
+    def is_saved(self, meal_id):
+        return self._saved[meal_id] > 0
+
+    def add(self, meal_id, title, image_url, recipe=None, user=LOCAL_USER):
+        if is_untranslated(recipe):
+            # Снимок на английском жил бы 30 дней; дополнится при следующем открытии
+            recipe = None
+        ids = self._user_ids(user)
+        with self._lock:
+            if meal_id in ids:
+                return
+            ids.add(meal_id)
+            self._saved[meal_id] += 1
+            self._pending.append(
+                (
+                    "INSERT OR IGNORE INTO favorites "
+                    "(user_id, meal_id, title, image_url, recipe_json, saved_at, category, area) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        user,
+                        meal_id,
+                        title,
+                        image_url,
+                        json.dumps(recipe, ensure_ascii=False) if recipe else None,
+                        time.time() if recipe else None,
+                        (recipe or {}).get("category") or "",
+                        (recipe or {}).get("area") or "",
+                    ),
+                )
+            )
+        self._wakeup.set()
+
+    def save_snapshot(self, meal_id, recipe):
+        if is_untranslated(recipe):
+            return
+        with self._lock:
+            self._pending.append(
+                (
+                    "UPDATE favorites SET recipe_json = ?, saved_at = ?, category = ?, area = ? WHERE meal_id = ?",
+                    (
+                        json.dumps(recipe, ensure_ascii=False),
+                        time.time(),
+                        recipe.get("category") or "",
+                        recipe.get("area") or "",
+                        meal_id,
+                    ),
+                )
+            )
+        self._wakeup.set()
+
+    def snapshot(self, meal_id):
+        if not self.is_saved(meal_id):
+            return None
+        rows = self._query(
+            "SELECT recipe_json, saved_at FROM favorites WHERE meal_id = ? AND recipe_json IS NOT NULL "
+            "ORDER BY saved_at DESC LIMIT 1",
+            (meal_id,),
+        )
+        if not rows:
+            return None
+        return json.loads(rows[0][0]), rows[0][1] or 0
+
+    def remove(self, meal_id, user=LOCAL_USER):
+        ids = self._user_ids(user)
+        with self._lock:
+            if meal_id not in ids:
+                return
+            ids.discard(meal_id)
+            self._saved[meal_id] -= 1
+            self._pending.append(("DELETE FROM favorites WHERE user_id = ? AND meal_id = ?", (user, meal_id)))
+        self._wakeup.set()
+
+    def toggle(self, meal_id, title, image_url, recipe=None, user=LOCAL_USER):
+        if self.contains(meal_id, user):
+            self.remove(meal_id, user)
+            return False
+        self.add(meal_id, title, image_url, recipe, user)
+        return True
+
+    def flush(self):
+        # Писатель один: пачки разных сессий не перемешиваются
+        with self._db_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return
+            try:
+                with self._pool.connection() as conn, conn:
+                    for sql, params in pending:
+                        conn.execute(sql, params)
+            except Exception:
+                # Транзакция откатилась целиком: возвращаем пачку в начало очереди,
+                # перед кликами, пришедшими за время записи
+                with self._lock:
+                    self._pending[:0] = pending
+                raise
+
+    def _write_loop(self):
+        while True:
+            self._wakeup.wait()
+            # Копим клики flush_delay секунд и пишем одной транзакцией
+            time.sleep(self.flush_delay)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # Писатель не должен умирать: пачка уже в очереди, повторим через flush_delay
+                print(f"Избранное не записано, повтор: {e}", file=sys.stderr)
+                self._wakeup.set()
+
+    def _query(self, sql, params=()):
+        self.flush()
+        with self._pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def last(self, user=LOCAL_USER):
+        rows = self._query(
+            "SELECT meal_id, title, image_url FROM favorites WHERE user_id = ? ORDER BY rowid DESC LIMIT 1",
+            (user,),
+        )
+        return rows[0] if rows else None
+
+    def page(
+        self,
+        sort="added",
+        category=None,
+        area=None,
+        title=None,
+        after=None,
+        limit=FAVORITES_PAGE_SIZE,
+        user=LOCAL_USER,
+    ):
+        """
+        Одна страница избранного. after — курсор из предыдущего вызова:
+        страница начинается строго после него, без OFFSET.
+        Возвращает (строки, курсор следующей страницы или None).
+        """
+        column, direction = FAVORITES_SORTS[sort]
+        where = ["user_id = ?"]
+        params = [user]
+        if category:
+            where.append("category = ?")
+            params.append(category)
+        if area:
+            where.append("area = ?")
+            params.append(area)
+        if title:
+            where.append("title LIKE ?")
+            params.append(f"%{title}%")
+        if after is not None:
+            if column == "rowid":
+                where.append("rowid < ?")
+                params.append(after[1])
+            else:
+                where.append(f"({column}, rowid) > (?, ?)")
+                params.extend(after)
+        sql = f"SELECT {column}, rowid, meal_id, title, image_url, category, area FROM favorites"
+        sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {column} {direction}, rowid {direction} LIMIT ?"
+        rows = self._query(sql, params + [limit])
+        cursor = (rows[-1][0], rows[-1][1]) if len(rows) == limit else None
+        return [row[2:] for row in rows], cursor
+
+    def facets(self, user=LOCAL_USER):
+        categories = self._query(
+            "SELECT DISTINCT category FROM favorites WHERE user_id = ? AND category != '' ORDER BY category", (user,)
+        )
+        areas = self._query(
+            "SELECT DISTINCT area FROM favorites WHERE user_id = ? AND area != '' ORDER BY area", (user,)
+        )
+        return [row[0] for row in categories], [row[0] for row in areas]
+
+class UserFavorites:
+    """
+    Избранное одного пользователя: методы FavoritesRepository с уже подставленным user.
+    """
+
+    def __init__(self, repository, user):
+        self.repository = repository
+        self.user = user
+
+    def contains(self, meal_id):
+        return self.repository.contains(meal_id, self.user)
+
+    def toggle(self, meal_id, title, image_url, recipe=None):
+        return self.repository.toggle(meal_id, title, image_url, recipe, self.user)
+
+    def remove(self, meal_id):
+        self.repository.remove(meal_id, self.user)
+
+    def last(self):
+        return self.repository.last(self.user)
+
+    def page(self, **kwargs):
+        return self.repository.page(user=self.user, **kwargs)
+
+    def facets(self):
+        return self.repository.facets(self.user)
+
+favorites = Lazy(lambda: FavoritesRepository(FAVORITES_DB))
+
+# Включается флагом --async: обработчики не блокируют UI, загрузка экрана
+# отменяется при переходе назад или новом поиске
+ASYNC_MODE = False
+
+def cancel_screen_task(page: ft.Page):
+    task = page.session.get("screen_task")
+    if task is not None and not task.done():
+        task.cancel()
+    page.session.set("screen_task", None)
+
+def run_screen_task(page: ft.Page, handler, *args):
+    cancel_screen_task(page)
+    page.session.set("screen_task", page.run_task(handler, page, *args))
+
+VIEW_STACK_LIMIT = 8
+
+class Router:
+    """
+    Навигация стеком ft.View. Открытые экраны не пересобираются: «назад»
+    просто снимает верхний View, и предыдущий экран возвращается с данными
+    и прокруткой. В памяти держится не больше VIEW_STACK_LIMIT экранов.
+    Части экранов, зависящие от общих данных, подписываются на тег
+    (например, "favorites") и обновляются при возврате, если тег помечен.
+    """
+
+    def __init__(self, page: ft.Page, limit=VIEW_STACK_LIMIT):
+        self.page = page
+        self.limit = limit
+        self._listeners = {}
+        self._dirty = set()
+        page.on_view_pop = lambda e: self.back()
+
+    def push(self, route, *controls):
+        view = ft.View(
+            route=route,
+            controls=list(controls),
+            padding=self.page.padding,
+            bgcolor=self.page.bgcolor,
+            horizontal_alignment=self.page.horizontal_alignment,
+            vertical_alignment=self.page.vertical_alignment,
+        )
+        self.page.views.append(view)
+        while len(self.page.views) > self.limit:
+            # Бюджет превышен: выбрасываем самый старый экран над главным
+            self._forget(self.page.views.pop(1))
+        self.page.update()
+        return view
+
+    def back(self):
+        cancel_screen_task(self.page)
+        if len(self.page.views) > 1:
+            self._forget(self.page.views.pop())
+        top = self.page.views[-1]
+        for tag, callback in self._listeners.get(id(top), {}).items():
+            if (id(top), tag) in self._dirty:
+                self._dirty.discard((id(top), tag))
+                callback()
+        self.page.update()
+
+    def home(self):
+        cancel_screen_task(self.page)
+        while len(self.page.views) > 1:
+            self._forget(self.page.views.pop())
+
+    def top(self):
+        return self.page.views[-1]
+
+    def subscribe(self, view, tag, callback):
+        self._listeners.setdefault(id(view), {})[tag] = callback
+
+    def invalidate(self, tag):
+        for view_id, callbacks in self._listeners.items():
+            if tag in callbacks:
+                self._dirty.add((view_id, tag))
+
+    def _forget(self, view):
+        self._listeners.pop(id(view), None)
+        self._dirty = {key for key in self._dirty if key[0] != id(view)}
+
+def get_router(page: ft.Page) -> Router:
+    router = page.session.get("router")
+    if router is None:
+        router = Router(page)
+        page.session.set("router", router)
+    return router
+
+# Включается командой web: у каждого браузера своё избранное
+WEB_MODE = False
+USER_ID_KEY = "culinary.user_id"
+WEB_HOST_ENV = "CULINARY_HOST"
+WEB_PORT_ENV = "CULINARY_PORT"
+WEB_PORT = 8550
+
+def session_user(page: ft.Page):
+    if not WEB_MODE:
+        return LOCAL_USER
+    # id живёт в localStorage браузера, поэтому переживает перезагрузку страницы
+    user = page.client_storage.get(USER_ID_KEY)
+    if not user:
+        import uuid
+
+        user = uuid.uuid4().hex
+        page.client_storage.set(USER_ID_KEY, user)
+    return user
+
+def user_favorites(page: ft.Page) -> UserFavorites:
+    view = page.session.get("favorites")
+    if view is None:
+        view = favorites.for_user(session_user(page))
+        page.session.set("favorites", view)
+    return view
+
+def go_back(page: ft.Page):
+    get_router(page).back()
+
+def open_recipe(page: ft.Page, meal_id: str):
+    if ASYNC_MODE:
+        run_screen_task(page, view_recipe_async, meal_id)
+    else:
+        view_recipe(page, meal_id)
+
+def open_category(page: ft.Page, category_en: str):
+    if ASYNC_MODE:
+        run_screen_task(page, show_category_recipes_async, category_en)
+    else:
+        show_category_recipes(page, category_en)
+
+def category_card(title_ru: str, image_url: str, category_en: str, page: ft.Page):
+    return ft.Card(
+        width=180,
+        height=220,
+        content=ft.Container(
+            bgcolor="#1F1F2A",
+            padding=10,
+            border_radius=ft.border_radius.all(15),
+            content=ft.Column(
+                spacing=8,
+                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                controls=[
+                    ft.Image(
+                        src=first_frame_image_src(image_url, 160),
+                        width=160,
+                        height=80,
+                        fit=ft.ImageFit.COVER,
+                    ),
+                    ft.Text(
+                        title_ru,
+                        color=ft.Colors.WHITE,
+                        size=16,
+                        weight=ft.FontWeight.BOLD,
+                        font_family="Poppins",
+                        no_wrap=True,
+                        max_lines=1,
+                        text_align=ft.TextAlign.CENTER,
+                    ),
+                    ft.ElevatedButton(
+                        text="Подробнее",
+                        bgcolor=ft.Colors.PINK_400,
+                        color=ft.Colors.WHITE,
+                        on_click=lambda e, c=category_en: open_category(page, c),
+                    ),
+                ],
+            ),
+        ),
+        elevation=5,
+    )
+
+LIST_PAGE_SIZE = 6
+LIST_PREFETCH_SCREENS = 1.5
+
+def meal_titles_ru(meals):
+    # Из локального каталога названия приходят уже переведёнными
+    missing = [m["strMeal"] for m in meals if not m.get("strMealRu")]
+    translated = iter(translator_en_ru.translate_parallel(missing))
+    return [m.get("strMealRu") or next(translated) for m in meals]
+
+def meal_card(page: ft.Page, meal_id: str, title_ru: str, img_url: str):
+    return ft.Container(
+        bgcolor="#1F1F2A",
+        border_radius=ft.border_radius.all(15),
+        padding=15,
+        margin=ft.margin.symmetric(horizontal=10),
+        content=ft.Column(
+            spacing=12,
+            controls=[
+                ft.Row(
+                    alignment=ft.MainAxisAlignment.CENTER,
+                    controls=[
+                        ft.Container(
+                            border_radius=ft.border_radius.all(15),
+                            clip_behavior=ft.ClipBehavior.ANTI_ALIAS,
+                            content=ft.Image(
+                                src=image_cache.src(img_url, page.window.width - 60),
+                                width=page.window.width - 60,
+                                height=180,
+                                fit=ft.ImageFit.COVER,
+                            ),
+                        ),
+                    ],
+                ),
+                ft.Text(
+                    title_ru,
+                    color=ft.Colors.WHITE,
+                    size=20,
+                    weight=ft.FontWeight.BOLD,
+                    font_family="Montserrat",
+                ),
+                ft.ElevatedButton(
+                    text="Подробнее",
+                    bgcolor=ft.Colors.PINK_400,
+                    color=ft.Colors.WHITE,
+                    height=48,
+                    style=ft.ButtonStyle(padding=8),
+                    on_click=lambda e, m_id=meal_id: open_recipe(page, m_id),
+                ),
+            ],
+        ),
+    )
+
+class LazyMealList:
+    """
+    Список карточек, который строится порциями: сначала видимая часть с запасом,
+    остальное — по мере прокрутки. Названия переводятся только для построенных карточек;
+    titles_ru — уже переведённые названия первых карточек, тогда первая порция
+    строится без обращения к переводчику (асинхронный режим строит её в цикле событий).
+    """
+
+    def __init__(self, page: ft.Page, meals, page_size=LIST_PAGE_SIZE, titles_ru=None):
+        self.page = page
+        self.meals = meals
+        self.page_size = page_size
+        self.titles_ru = list(titles_ru or [])
+        self.loaded = 0
+        self._lock = threading.Lock()
+        self.view = ft.ListView(
+            expand=True,
+            spacing=10,
+            on_scroll_interval=100,
+            on_scroll=self._on_scroll,
+        )
+        recipe_prefetcher.reset(page.session_id)
+        self.load_more()
+
+    def has_more(self):
+        return self.loaded < len(self.meals)
+
+    def load_more(self):
+        with self._lock:
+            batch = self.meals[self.loaded : self.loaded + self.page_size]
+            if not batch:
+                return False
+            known = self.titles_ru[self.loaded : self.loaded + len(batch)]
+            titles_ru = known if len(known) == len(batch) else meal_titles_ru(batch)
+            self.view.controls.extend(
+                meal_card(self.page, m["idMeal"], title_ru, m["strMealThumb"])
+                for m, title_ru in zip(batch, titles_ru)
+            )
+            self.loaded += len(batch)
+            # Скорее всего откроют одну из первых карточек — готовим её заранее
+            recipe_prefetcher.prefetch((m["idMeal"] for m in batch[:PREFETCH_COUNT]), self.page.session_id)
+            # Картинки следующего экрана качаем заранее
+            upcoming = self.meals[self.loaded : self.loaded + self.page_size]
+            image_cache.prefetch(
+                (m["strMealThumb"], self.page.window.width - 60) for m in upcoming
+            )
+            return True
+
+    def _on_scroll(self, e: ft.OnScrollEvent):
+        if e.pixels is None or e.max_scroll_extent is None or not self.has_more():
+            return
+        # Подгружаем, когда до конца списка осталось меньше LIST_PREFETCH_SCREENS экранов
+        if e.max_scroll_extent - e.pixels <= e.viewport_dimension * LIST_PREFETCH_SCREENS:
+            if self.load_more():
+                self.view.update()
+
+def category_title_ru(category_en):
+    return catalog.category_ru(category_en) or translator_en_ru.translate(category_en)
+
+def load_category_meals(category_en):
+    meals = catalog.meals_by_category(category_en)
+    if not meals:
+        try:
+            meals = mealdb.filter_by_category(category_en)
+        except Exception:
+            meals = []
+    return meals
+
+def category_screen(page: ft.Page, category_ru: str, category_en: str):
+
+    title_text = ft.Text(
+        category_ru,
+        color=ft.Colors.WHITE,
+        size=24,
+        weight=ft.FontWeight.BOLD,
+    )
+    top_bar = ft.Row(
+        [
+            ft.IconButton(
+                ft.Icons.ARROW_BACK,
+                icon_color=ft.Colors.WHITE,
+                icon_size=28,
+                on_click=lambda e: go_back(page),
+            ),
+            title_text,
+        ],
+        alignment=ft.MainAxisAlignment.START,
+    )
+
+    results_column = ft.Column(expand=True, spacing=10)
+    results_column.controls.append(
+        ft.Container(
+            content=ft.ProgressRing(
+                width=50,
+                height=50,
+                stroke_width=6,
+                color=ft.Colors.PINK_400,
+            ),
+            alignment=ft.alignment.center,
+            padding=20,
+        )
+    )
+
+    get_router(page).push(
+        f"/category/{category_en}",
+        ft.Column(
+            width=page.window.width,
+            spacing=20,
+            expand=True,
+            controls=[top_bar, results_column],
+        ),
+    )
+    return title_text, results_column
+
+def show_meal_results(page: ft.Page, results_column: ft.Column, meals, titles_ru=None):
+    results_column.controls.clear()
+    if meals:
+        results_column.controls.append(LazyMealList(page, meals, titles_ru=titles_ru).view)
+    else:
+        results_column.controls.append(
+            ft.Text("Рецепты не найдены", color=ft.Colors.WHITE, size=20)
+        )
+    page.update()
+
+def show_category_recipes(page: ft.Page, category_en: str):
+    _, results_column = category_screen(page, category_title_ru(category_en), category_en)
+    show_meal_results(page, results_column, load_category_meals(category_en))
+
+async def load_category_meals_async(category_en):
+    meals = await asyncio.to_thread(lambda: catalog.meals_by_category(category_en))
+    if not meals:
+        try:
+            meals = await async_mealdb.filter_by_category(category_en)
+        except Exception:
+            meals = []
+    # Первая порция карточек переводится здесь же, в фоне, чтобы список не ждал
+    return meals, await asyncio.to_thread(meal_titles_ru, meals[:LIST_PAGE_SIZE])
+
+async def show_category_recipes_async(page: ft.Page, category_en: str):
+    title_text, results_column = category_screen(page, category_en, category_en)
+    category_ru, (meals, titles_ru) = await asyncio.gather(
+        asyncio.to_thread(category_title_ru, category_en),
+        load_category_meals_async(category_en),
+    )
+    title_text.value = category_ru
+    show_meal_results(page, results_column, meals, titles_ru)
+
+def main(page: ft.Page):
+    tracer.instrument_page(page)
+    router = get_router(page)
+    router.home()
+    page.title = "Culinary Mastermind"
+    page.window.frameless = True
+    page.window.width = 380
+    page.window.height = 800
+    page.window.resizable = False
+
+    page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
+    page.vertical_alignment = ft.MainAxisAlignment.START
+    page.padding = 0
+    page.bgcolor = "#2C2C3E"
+
+    header_text = ft.Text(
+        value="Culinary Mastermind",
+        size=32,
+        weight=ft.FontWeight.BOLD,
+        color=ft.Colors.WHITE,
+        font_family="Poppins",
+    )
+
+    subheader_text = ft.Text(
+        value="Готовьте шедевры из того, что есть в холодильнике!",
+        size=18,
+        color=ft.Colors.GREY_300,
+        font_family="Roboto",
+    )
+
+    recipes_row = ft.Row(
+        spacing=10,
+        scroll=ft.ScrollMode.AUTO,
+        controls=[
+            category_card(
+                "Курица",
+                MEALDB_CATEGORY_IMAGE.format("chicken"),
+                "Chicken",
+                page,
+            ),
+            category_card(
+                "Говядина",
+                MEALDB_CATEGORY_IMAGE.format("beef"),
+                "Beef",
+                page,
+            ),
+            category_card(
+                "Морепродукты",
+                MEALDB_CATEGORY_IMAGE.format("seafood"),
+                "Seafood",
+                page,
+            ),
+        ],
+    )
+
+    def recipe_card(title: str, prep_time: int, calories: int, image_url: str):
+        return ft.Card(
+            width=160,
+            height=250,
+            content=ft.Container(
+                bgcolor="#1F1F2A",
+                padding=10,
+                border_radius=ft.border_radius.all(15),
+                content=ft.Column(
+                    spacing=3,
+                    controls=[
+                        ft.Image(
+                            src=first_frame_image_src(image_url, 120),
+                            width=120,
+                            height=50,
+                            fit=ft.ImageFit.COVER,
+                        ),
+                        ft.Text(
+                            title,
+                            color=ft.Colors.WHITE,
+                            size=18,
+                            weight=ft.FontWeight.BOLD,
+                            font_family="Poppins",
+                        ),
+                        ft.Text(
+                            f"Время: {prep_time} мин",
+                            color=ft.Colors.GREY_300,
+                            size=14,
+                            font_family="Roboto",
+                        ),
+                        ft.Text(
+                            f"Калории: {calories}",
+                            color=ft.Colors.GREY_300,
+                            size=14,
+                            font_family="Roboto",
+                        ),
+                        ft.ElevatedButton(
+                            text="Подробнее",
+                            bgcolor=ft.Colors.PINK_400,
+                            color=ft.Colors.WHITE,
+                            height=40,
+                            style=ft.ButtonStyle(padding=5),
+                            on_click=lambda e: print(f"Подробности рецепта: {title}"),
+                        ),
+                    ],
+                ),
+            ),
+            elevation=10,
+        )
+
+    def load_last_favorite():
+        row = user_favorites(page).last()
+        if row is None:
+            return ft.Text("Нет избранного", color=ft.Colors.WHITE, size=16)
+        meal_id, title, image_url = row
+        return ft.Container(
+            padding=10,
+            bgcolor="#2E2F45",
+            border_radius=ft.border_radius.all(10),
+            margin=ft.margin.symmetric(vertical=5),
+            content=ft.Row(
+                spacing=10,
+                controls=[
+                    ft.Icon(ft.Icons.FAVORITE, color=ft.Colors.PINK_400, size=24),
+                    ft.Text(
+                        title,
+                        color=ft.Colors.WHITE,
+                        size=16,
+                        font_family="Roboto",
+                        expand=True,
+                    ),
+                    ft.ElevatedButton(
+                        text="Подробнее",
+                        bgcolor=ft.Colors.PINK_400,
+                        color=ft.Colors.WHITE,
+                        on_click=lambda e, m_id=meal_id: open_recipe(page, m_id),
+                    ),
+                ],
+            ),
+        )
+
+    if favorites.is_loaded():
+        last_fav_control = ft.Container(content=load_last_favorite())
+    else:
+        # База избранного откроется уже после первого кадра, в warm_up
+        last_fav_control = ft.Container(
+            content=ft.ProgressRing(width=24, height=24, stroke_width=3, color=ft.Colors.PINK_400)
+        )
+
+    top_bar = ft.Row(
+        [
+            ft.IconButton(
+                ft.Icons.MENU,
+                icon_color=ft.Colors.WHITE,
+                on_click=lambda e: open_side_menu(page),
+            ),
+            ft.Container(expand=True),
+        ],
+        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+    )
+
+    search_button_container = ft.Container(
+        content=ft.IconButton(
+            ft.Icons.SEARCH,
+            icon_size=40,
+            icon_color=ft.Colors.WHITE,
+            bgcolor=ft.Colors.PINK_400,
+            on_click=lambda e: open_search_screen(page),
+        ),
+        alignment=ft.Alignment(0, 1),
+        margin=ft.margin.only(top=20),
+    )
+
+    main_content = ft.Column(
+        width=page.window.width,
+        spacing=20,
+        alignment=ft.MainAxisAlignment.START,
+        controls=[
+            top_bar,
+            header_text,
+            subheader_text,
+            recipes_row,
+            ft.Text(
+                "Избранное",
+                size=20,
+                weight=ft.FontWeight.BOLD,
+                color=ft.Colors.WHITE,
+                font_family="Poppins",
+            ),
+            last_fav_control,
+        ],
+    )
+
+    side_menu = ft.Container(
+        visible=False,
+        expand=True,
+        on_click=lambda e: close_side_menu(page),
+        bgcolor=ft.Colors.with_opacity(0.5, ft.Colors.BLACK),
+        content=ft.Row(
+            expand=True,
+            alignment=ft.MainAxisAlignment.START,
+            controls=[
+                ft.Container(
+                    width=220,
+                    bgcolor="#2E2F45",
+                    padding=20,
+                    content=ft.Column(
+                        spacing=10,
+                        controls=[
+                            ft.Text(
+                                "Меню",
+                                color=ft.Colors.WHITE,
+                                size=20,
+                                weight=ft.FontWeight.BOLD,
+                            ),
+                            ft.Divider(color=ft.Colors.GREY_700),
+                            ft.Container(
+                                on_click=lambda e: favorites_menu_click(page),
+                                content=ft.Row(
+                                    spacing=5,
+                                    controls=[
+                                        ft.Icon(
+                                            ft.Icons.STAR,
+                                            color=ft.Colors.ORANGE,
+                                            size=24,
+                                        ),
+                                        ft.Text(
+                                            "Избранное",
+                                            color=ft.Colors.WHITE,
+                                            size=16,
+                                        ),
+                                    ],
+                                ),
+                            ),
+                        ],
+                    ),
+                ),
+                ft.Container(expand=True),
+            ],
+        ),
+    )
+
+    def close_side_menu(page: ft.Page):
+        side_menu.visible = False
+        page.update()
+
+    def open_side_menu(page: ft.Page):
+        side_menu.visible = True
+        page.update()
+
+    def favorites_menu_click(page: ft.Page):
+        close_side_menu(page)
+        open_favorites_screen(page)
+
+    def refresh_last_favorite():
+        # После изменения избранного пересобирается только этот блок
+        last_fav_control.content = load_last_favorite()
+
+    router.subscribe(page.views[0], "favorites", refresh_last_favorite)
+
+    page.controls.clear()
+    page.add(ft.Stack(expand=True, controls=[main_content, side_menu]), search_button_container)
+    page.update()
+
+    if "first_frame_ms" not in startup_metrics:
+        startup_metrics["first_frame_ms"] = (time.perf_counter() - PROCESS_START) * 1000
+        print(f"Первый кадр: {startup_metrics['first_frame_ms']:.0f} мс")
+    if not favorites.is_loaded():
+        threading.Thread(target=warm_up, args=(page, refresh_last_favorite), daemon=True).start()
+
+startup_metrics = {}
+
+def warm_up(page: ft.Page, refresh_last_favorite):
+    # Всё, что не нужно для первого кадра: базы, схемы, индексы, сеть
+    started = time.perf_counter()
+    favorites.instance()
+    refresh_last_favorite()
+    page.update()
+    translation_cache.instance()
+    mealdb.instance()
+    image_cache.instance()
+    if catalog.is_ready():
+        ingredient_index.build(catalog)
+    suggest_index.ensure_loaded(catalog)
+    startup_metrics["warm_up_ms"] = (time.perf_counter() - started) * 1000
+    print(f"Прогрев кэшей: {startup_metrics['warm_up_ms']:.0f} мс")
+
+def open_search_screen(page: ft.Page):
+    top_bar = ft.Row(
+        [
+            ft.IconButton(
+                ft.Icons.ARROW_BACK,
+                icon_color=ft.Colors.WHITE,
+                icon_size=28,
+                on_click=lambda e: go_back(page),
+            ),
+        ],
+        alignment=ft.MainAxisAlignment.START,
+    )
+    search_field = ft.TextField(
+        label="Введите ингредиенты (на русском)",
+        autofocus=True,
+        bgcolor="#2C2E3E",
+        border_radius=ft.border_radius.all(20),
+        color=ft.Colors.WHITE,
+        prefix_icon=ft.Icon(ft.Icons.SEARCH, color=ft.Colors.PINK_400, size=24),
+        height=55,
+        width=page.window.width - 40,
+        text_size=18,
+    )
+    results_column_ref = ft.Ref[ft.Column]()
+    results_column = ft.Column(ref=results_column_ref, expand=True, spacing=10)
+
+    suggestions = ft.Column(spacing=0, visible=False)
+    debounce = {"timer": None}
+    threading.Thread(target=suggest_index.ensure_loaded, args=(catalog,), daemon=True).start()
+
+    def search_handler(e):
+        suggestions.visible = False
+        if ASYNC_MODE:
+            run_screen_task(page, perform_search_async, search_field.value, results_column_ref)
+        else:
+            perform_search(page, search_field.value, results_column_ref)
+
+    def pick_suggestion(item):
+        kind, label_ru, _, meal_id = item
+        if kind == "meal":
+            open_recipe(page, meal_id)
+            return
+        # Заменяем последний введённый ингредиент выбранным и сразу ищем
+        terms = split_ingredients(search_field.value or "")[:-1] + [label_ru]
+        search_field.value = ", ".join(terms)
+        search_handler(None)
+
+    def show_suggestions():
+        if suggestions.page is None:
+            return
+        terms = (search_field.value or "").replace(";", ",").split(",")
+        items = suggest_index.suggest(terms[-1]) if terms else []
+        suggestions.controls = [
+            ft.ListTile(
+                dense=True,
+                leading=ft.Icon(
+                    ft.Icons.KITCHEN if kind == "ingredient" else ft.Icons.RESTAURANT_MENU,
+                    color=ft.Colors.PINK_400,
+                ),
+                title=ft.Text(label_ru, color=ft.Colors.WHITE),
+                subtitle=ft.Text(name_en, color=ft.Colors.GREY_500),
+                on_click=lambda e, item=(kind, label_ru, name_en, meal_id): pick_suggestion(item),
+            )
+            for kind, label_ru, name_en, meal_id in items
+        ]
+        suggestions.visible = bool(items)
+        suggestions.update()
+
+    def on_change(e):
+        # Сетевых запросов здесь нет: только локальный индекс, не чаще раза в кадр
+        if debounce["timer"] is not None:
+            debounce["timer"].cancel()
+        debounce["timer"] = threading.Timer(SUGGEST_DEBOUNCE, show_suggestions)
+        debounce["timer"].start()
+
+    search_field.on_submit = search_handler
+    search_field.on_change = on_change
+
+    get_router(page).push(
+        "/search",
+        ft.Column(
+            width=page.window.width,
+            spacing=20,
+            expand=True,
+            controls=[
+                top_bar,
+                ft.Container(
+                    padding=20,
+                    content=ft.Column(spacing=5, controls=[search_field, suggestions]),
+                ),
+                results_column,
+            ],
+        ),
+    )
+
+def search_loading(page: ft.Page, results_column: ft.Column):
+    results_column.controls.clear()
+    results_column.controls.append(
+        ft.Container(
+            content=ft.ProgressRing(
+                width=60, height=60, stroke_width=8, color=ft.Colors.PINK_400
+            ),
+            alignment=ft.alignment.center,
+            padding=20,
+        )
+    )
+    page.update()
+
+def perform_search(page: ft.Page, query: str, results_ref: ft.Ref[ft.Column]):
+    results_column = results_ref.current
+    search_loading(page, results_column)
+    show_meal_results(page, results_column, find_meals(query))
+
+async def perform_search_async(page: ft.Page, query: str, results_ref: ft.Ref[ft.Column]):
+    results_column = results_ref.current
+    search_loading(page, results_column)
+    meals = await find_meals_async(query)
+    titles_ru = await asyncio.to_thread(meal_titles_ru, meals[:LIST_PAGE_SIZE])
+    show_meal_results(page, results_column, meals, titles_ru)
+
+# Единицы TheMealDB -> формы для 1, 2-4 и 5+ (дробные числа берут вторую)
+MEASURE_UNITS = {
+    "tbsp": ("ст. л.", "ст. л.", "ст. л."),
+    "tsp": ("ч. л.", "ч. л.", "ч. л."),
+    "g": ("г", "г", "г"),
+    "kg": ("кг", "кг", "кг"),
+    "ml": ("мл", "мл", "мл"),
+    "l": ("л", "л", "л"),
+    "cup": ("стакан", "стакана", "стаканов"),
+    "clove": ("зубчик", "зубчика", "зубчиков"),
+    "pinch": ("щепотка", "щепотки", "щепоток"),
+    "can": ("банка", "банки", "банок"),
+    "handful": ("горсть", "горсти", "горстей"),
+    "slice": ("ломтик", "ломтика", "ломтиков"),
+    "sprig": ("веточка", "веточки", "веточек"),
+    "bunch": ("пучок", "пучка", "пучков"),
+    "stick": ("палочка", "палочки", "палочек"),
+    "packet": ("упаковка", "упаковки", "упаковок"),
+    "leaf": ("лист", "листа", "листов"),
+    "piece": ("шт.", "шт.", "шт."),
+}
+MEASURE_ALIASES = {
+    "tbsp": ["tbs", "tbsp", "tblsp", "tbls", "tbl", "tb", "tablespoon", "tablespoons"],
+    "tsp": ["tsp", "tspn", "tsps", "teaspoon", "teaspoons"],
+    "g": ["g", "gr", "grs", "gram", "grams", "gramme", "grammes"],
+    "kg": ["kg", "kgs", "kilo", "kilos", "kilogram", "kilograms"],
+    "ml": ["ml", "millilitre", "millilitres", "milliliter", "milliliters"],
+    "l": ["l", "litre", "litres", "liter", "liters"],
+    "cup": ["cup", "cups", "c"],
+    "clove": ["clove", "cloves"],
+    "pinch": ["pinch", "pinches"],
+    "can": ["can", "cans", "tin", "tins"],
+    "handful": ["handful", "handfuls"],
+    "slice": ["slice", "slices"],
+    "sprig": ["sprig", "sprigs"],
+    "bunch": ["bunch", "bunches"],
+    "stick": ["stick", "sticks"],
+    "packet": ["packet", "packets", "pack", "packs", "package", "packages"],
+    "leaf": ["leaf", "leaves"],
+    "piece": ["piece", "pieces", "pc", "pcs", "whole"],
+}
+MEASURE_UNIT_BY_ALIAS = {alias: unit for unit, aliases in MEASURE_ALIASES.items() for alias in aliases}
+# Имперские меры сразу переводятся в метрические: (единица, множитель)
+MEASURE_CONVERSIONS = {
+    "oz": ("g", 28.35), "ounce": ("g", 28.35), "ounces": ("g", 28.35),
+    "lb": ("g", 453.6), "lbs": ("g", 453.6), "pound": ("g", 453.6), "pounds": ("g", 453.6),
+    "pint": ("ml", 568), "pints": ("ml", 568),
+    "cl": ("ml", 10),
+    "dl": ("ml", 100),
+}
+MEASURE_PHRASES = {
+    "to taste": "по вкусу",
+    "to serve": "для подачи",
+    "for serving": "для подачи",
+    "garnish": "для украшения",
+    "to garnish": "для украшения",
+    "for garnish": "для украшения",
+    "dash": "немного",
+    "splash": "немного",
+    "drizzle": "немного",
+    "sprinkling": "немного",
+    "sprinkle": "немного",
+}
+UNICODE_FRACTIONS = {"½": "1/2", "⅓": "1/3", "⅔": "2/3", "¼": "1/4", "¾": "3/4", "⅛": "1/8"}
+MEASURE_NUMBER = r"\d+\s+\d+/\d+|\d+/\d+|\d+(?:[.,]\d+)?"
+MEASURE_PATTERN = re.compile(
+    rf"^(?P<low>{MEASURE_NUMBER})(?:\s*(?:-|–|to)\s*(?P<high>{MEASURE_NUMBER}))?\s*(?P<unit>[a-z]*)\.?$"
+)
+
+Measure = namedtuple("Measure", ["low", "high", "unit"])
+
+def parse_number(text):
+    text = text.replace(",", ".")
+    if " " in text:
+        whole, part = text.split()
+        return int(whole) + Fraction(part)
+    return Fraction(text)
+
+def parse_measure(text):
+    """
+    "1 1/2 tbs" -> Measure(Fraction(3, 2), None, "tbsp"), "2-3 cloves" ->
+    Measure(2, 3, "clove"). Унции, фунты и пинты пересчитываются в граммы
+    и миллилитры. Для всего, что не разобрано целиком, возвращает None.
+    """
+    text = (text or "").strip().lower()
+    for char, fraction in UNICODE_FRACTIONS.items():
+        text = text.replace(char, f" {fraction}")
+    text = " ".join(text.split())
+    match = MEASURE_PATTERN.match(text)
+    if match is None:
+        return None
+    low = parse_number(match["low"])
+    high = parse_number(match["high"]) if match["high"] else None
+    unit = match["unit"] or "piece"
+    if unit in MEASURE_CONVERSIONS:
+        unit, factor = MEASURE_CONVERSIONS[unit]
+        low = Fraction(low * Fraction(factor))
+        high = Fraction(high * Fraction(factor)) if high is not None else None
+    elif unit in MEASURE_UNIT_BY_ALIAS:
+        unit = MEASURE_UNIT_BY_ALIAS[unit]
+    else:
+        return None
+    return Measure(low, high, unit)
+
+def format_amount(value, unit):
+    if unit in ("g", "ml") and value.denominator != 1:
+        # После пересчёта из унций: 226.8 г -> 225 г
+        value = Fraction(max(5, round(value / 5) * 5) if value > 10 else round(value))
+    if value.denominator == 1:
+        return str(value.numerator)
+    if value.denominator in (2, 3, 4, 8) and unit not in ("kg", "l"):
+        whole, part = divmod(value, 1)
+        return f"{whole} {part}" if whole else str(part)
+    return f"{float(value):.2f}".rstrip("0").rstrip(".").replace(".", ",")
+
+def ru_plural_form(value, forms):
+    if value.denominator != 1:
+        return forms[1]
+    n = value.numerator
+    if n % 10 == 1 and n % 100 != 11:
+        return forms[0]
+    if 2 <= n % 10 <= 4 and not 12 <= n % 100 <= 14:
+        return forms[1]
+    return forms[2]
+
+def measure_ru(text):
+    """
+    Мера по-русски без обращения к переводчику или None, если её нужно переводить.
+    """
+    text = (text or "").strip()
+    if not text:
+        return ""
+    phrase = MEASURE_PHRASES.get(" ".join(text.lower().rstrip(".").split()))
+    if phrase:
+        return phrase
+    measure = parse_measure(text)
+    if measure is None:
+        unit = MEASURE_UNIT_BY_ALIAS.get(text.lower().rstrip("."))
+        # "Pinch", "Handful" без числа
+        return MEASURE_UNITS[unit][0] if unit and unit != "piece" else None
+    low, high, unit = measure
+    if unit == "g" and (high or low) >= 1000:
+        unit, low, high = "kg", low / 1000, high / 1000 if high is not None else None
+    amount = format_amount(low, unit)
+    if high is not None:
+        amount = f"{amount}–{format_amount(high, unit)}"
+    return f"{amount} {ru_plural_form(high if high is not None else low, MEASURE_UNITS[unit])}"
+
+def translate_recipe(meal):
+    names_en = []
+    measures = []
+    for i in range(1, 21):
+        ing = meal.get(f"strIngredient{i}")
+        measure = (meal.get(f"strMeasure{i}") or "").strip()
+        if ing and ing.strip():
+            names_en.append(ing.strip())
+            measures.append((measure, measure_ru(measure)))
+    # В переводчик идут только меры, которые не разобрал measure_ru
+    measures_en = [measure for measure, ru in measures if ru is None]
+
+    fields = [
+        meal["strMeal"],
+        meal.get("strCategory") or "",
+        meal.get("strArea") or "",
+        meal.get("strTags") or "",
+    ]
+    # Инструкции переводятся по предложениям: "Serve hot." из кэша подходит ко всем рецептам
+    paragraphs = split_sentences(meal.get("strInstructions") or "")
+    sentences = [sentence for paragraph in paragraphs for sentence in paragraph]
+    translated = translator_en_ru.translate_batch(fields + names_en + measures_en + sentences)
+    names_end = len(fields) + len(names_en)
+    measures_end = names_end + len(measures_en)
+
+    translated_measures = iter(translated[names_end:measures_end])
+    untranslated = any(isinstance(text, Untranslated) for text in translated)
+    ingredients = []
+    for name_ru, (measure, ru) in zip(translated[len(fields) : names_end], measures):
+        if ru is None:
+            ru = next(translated_measures)
+        ingredients.append(f"{name_ru} - {ru}" if ru else name_ru)
+    recipe = {
+        "meal_id": meal["idMeal"],
+        "title": translated[0],
+        "instructions": join_sentences(paragraphs, translated[measures_end:]),
+        "image_url": meal["strMealThumb"],
+        "category": translated[1],
+        "area": translated[2],
+        "tags": translated[3],
+        "ingredients": ingredients,
+    }
+    if untranslated:
+        # Переводчики не ответили хотя бы на одну строку: показать можно, сохранять нельзя
+        recipe["untranslated"] = True
+    return recipe
+
+def is_untranslated(recipe):
+    return bool(recipe and recipe.get("untranslated"))
+
+def remember_if_favorite(meal_id, recipe):
+    # Старые записи избранного (до снимков) дополняются при первом открытии
+    if recipe is not None and not is_untranslated(recipe) and favorites.is_saved(meal_id):
+        favorites.save_snapshot(meal_id, recipe)
+    return recipe
+
+def fetch_recipe(meal_id):
+    try:
+        meal = mealdb.lookup(meal_id)
+    except Exception:
+        meal = None
+    if not meal:
+        return None
+    return remember_if_favorite(meal_id, translate_recipe(meal))
+
+def local_recipe(meal_id):
+    snapshot = favorites.snapshot(meal_id)
+    if snapshot is not None:
+        recipe, saved_at = snapshot
+        if time.time() - saved_at > FAVORITE_REFRESH_AGE:
+            threading.Thread(target=fetch_recipe, args=(meal_id,), daemon=True).start()
+        return recipe
+    return remember_if_favorite(meal_id, catalog.recipe(meal_id))
+
+def load_recipe(meal_id):
+    recipe = local_recipe(meal_id)
+    if recipe is not None:
+        return recipe
+    return fetch_recipe(meal_id)
+
+async def load_recipe_async(meal_id):
+    # Снимок из избранного и каталог — запросы к SQLite, им не место в цикле событий
+    recipe = await asyncio.to_thread(local_recipe, meal_id)
+    if recipe is not None:
+        return recipe
+    try:
+        meal = await async_mealdb.lookup(meal_id)
+    except Exception:
+        meal = None
+    if not meal:
+        return None
+    recipe = await asyncio.to_thread(translate_recipe, meal)
+    return await asyncio.to_thread(remember_if_favorite, meal_id, recipe)
+
+RECIPE_MEMORY_SIZE = 50
+PREFETCH_WORKERS = 2
+PREFETCH_COUNT = 3
+
+class RecipePrefetcher:
+    """
+    Заранее загружает и переводит рецепты первых карточек списка.
+    Работает в PREFETCH_WORKERS потоках; при открытии нового списка
+    ещё не начатые задачи той же сессии (owner) отменяются, чтобы не мешать
+    тому, что на экране. Готовые рецепты общие для всех сессий.
+    """
+
+    def __init__(self, loader, max_workers=PREFETCH_WORKERS, memory_size=RECIPE_MEMORY_SIZE):
+        self.loader = loader
+        self.memory_size = memory_size
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._inflight = {}
+        self._owners = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+
+    def remember(self, meal_id, recipe):
+        if is_untranslated(recipe):
+            return
+        with self._lock:
+            self._memory[meal_id] = recipe
+            self._memory.move_to_end(meal_id)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _load(self, meal_id):
+        recipe = self.loader(meal_id)
+        if recipe is not None:
+            self.remember(meal_id, recipe)
+            with self._lock:
+                self.prefetched += 1
+        with self._lock:
+            self._inflight.pop(meal_id, None)
+            self._owners.pop(meal_id, None)
+        return recipe
+
+    def reset(self, owner=None):
+        with self._lock:
+            for meal_id, future in self._inflight.items():
+                if owner is None or self._owners.get(meal_id) == owner:
+                    future.cancel()
+            self._inflight = {k: f for k, f in self._inflight.items() if not f.cancelled()}
+            self._owners = {k: o for k, o in self._owners.items() if k in self._inflight}
+
+    def prefetch(self, meal_ids, owner=None):
+        with self._lock:
+            for meal_id in meal_ids:
+                if meal_id in self._memory or meal_id in self._inflight:
+                    continue
+                self._inflight[meal_id] = self._pool.submit(self._load, meal_id)
+                self._owners[meal_id] = owner
+
+    def peek(self, meal_id):
+        with self._lock:
+            recipe = self._memory.get(meal_id)
+            if recipe is not None:
+                self._memory.move_to_end(meal_id)
+                self.hits += 1
+                return recipe
+            future = self._inflight.get(meal_id)
+            # Задача ещё стоит в очереди за другими: самим загрузить быстрее, чем ждать её
+            if future is not None and future.cancel():
+                self._inflight.pop(meal_id, None)
+                self._owners.pop(meal_id, None)
+                future = None
+        if future is not None and not future.cancelled():
+            try:
+                recipe = future.result()
+            except Exception:
+                recipe = None
+            if recipe is not None:
+                with self._lock:
+                    self.hits += 1
+                return recipe
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def get(self, meal_id):
+        recipe = self.peek(meal_id)
+        if recipe is None:
+            recipe = self.loader(meal_id)
+            if recipe is not None:
+                self.remember(meal_id, recipe)
+        return recipe
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "prefetched": self.prefetched,
+                "pending": len(self._inflight),
+            }
+
+recipe_prefetcher = RecipePrefetcher(load_recipe)
+
+def view_recipe(page: ft.Page, meal_id: str):
+    recipe = recipe_prefetcher.get(meal_id)
+    if not recipe:
+        print("Рецепт не найден или произошла ошибка.")
+        return
+    render_recipe(page, recipe)
+
+async def view_recipe_async(page: ft.Page, meal_id: str):
+    recipe = await asyncio.to_thread(recipe_prefetcher.peek, meal_id)
+    if recipe is None:
+        recipe = await load_recipe_async(meal_id)
+        if recipe is not None:
+            recipe_prefetcher.remember(meal_id, recipe)
+    if not recipe:
+        print("Рецепт не найден или произошла ошибка.")
+        return
+    # Первое обращение пользователя к избранному читает базу — не в цикле событий
+    saved = await asyncio.to_thread(user_favorites(page).contains, meal_id)
+    render_recipe(page, recipe, saved)
+
+def render_recipe(page: ft.Page, recipe, saved=None):
+    meal_id = recipe["meal_id"]
+    title_ru = recipe["title"]
+    instructions_ru = recipe["instructions"]
+    image_url = recipe["image_url"]
+    category_ru = recipe["category"]
+    area_ru = recipe["area"]
+    tags_ru = recipe["tags"]
+    ingredients = recipe["ingredients"]
+
+    instructions_lines = [line.strip() for line in instructions_ru.split("\n") if line.strip()]
+
+    if saved is None:
+        saved = user_favorites(page).contains(meal_id)
+    heart_button = ft.IconButton(
+        icon=ft.Icons.FAVORITE if saved else ft.Icons.FAVORITE_BORDER,
+        icon_color=ft.Colors.PINK_400,
+        icon_size=28,
+    )
+
+    def toggle_favorite(e):
+        if user_favorites(page).toggle(meal_id, title_ru, image_url, recipe):
+            heart_button.icon = ft.Icons.FAVORITE
+        else:
+            heart_button.icon = ft.Icons.FAVORITE_BORDER
+        get_router(page).invalidate("favorites")
+        heart_button.update()
+
+    heart_button.on_click = toggle_favorite
+
+    top_bar = ft.Row(
+        [
+            ft.IconButton(
+                ft.Icons.ARROW_BACK,
+                icon_color=ft.Colors.WHITE,
+                icon_size=28,
+                on_click=lambda e: go_back(page),
+            ),
+            heart_button,
+        ],
+        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+    )
+
+    area_card = ft.Container(
+        bgcolor="#34354A",
+        border_radius=ft.border_radius.all(15),
+        padding=ft.padding.symmetric(horizontal=10, vertical=8),
+        content=ft.Column(
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=3,
+            controls=[
+                ft.Icon(ft.Icons.PLACE, color=ft.Colors.PINK_400, size=24),
+                ft.Text(area_ru, color=ft.Colors.WHITE, size=18),
+            ],
+        ),
+    )
+    category_card_ctrl = ft.Container(
+        bgcolor="#34354A",
+        border_radius=ft.border_radius.all(15),
+        padding=ft.padding.symmetric(horizontal=10, vertical=8),
+        content=ft.Column(
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=3,
+            controls=[
+                ft.Icon(ft.Icons.CATEGORY, color=ft.Colors.PINK_400, size=24),
+                ft.Text(category_ru, color=ft.Colors.WHITE, size=18),
+            ],
+        ),
+    )
+    tags_card = ft.Container(
+        bgcolor="#34354A",
+        border_radius=ft.border_radius.all(15),
+        padding=ft.padding.symmetric(horizontal=10, vertical=8),
+        content=ft.Column(
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=3,
+            controls=[
+                ft.Icon(ft.Icons.LABEL, color=ft.Colors.PINK_400, size=24),
+                ft.Text(tags_ru, color=ft.Colors.WHITE, size=18),
+            ],
+        ),
+    )
+
+    detail_column = ft.Column(
+        scroll=ft.ScrollMode.AUTO,
+        expand=True,
+        spacing=20,
+        controls=[
+            ft.Row(
+                alignment=ft.MainAxisAlignment.CENTER,
+                controls=[
+                    ft.Container(
+                        border_radius=ft.border_radius.all(20),
+                        clip_behavior=ft.ClipBehavior.ANTI_ALIAS,
+                        content=ft.Image(
+                            src=image_cache.src(image_url, page.window.width - 40),
+                            width=page.window.width - 40,
+                            height=220,
+                            fit=ft.ImageFit.COVER,
+                        ),
+                    )
+                ],
+            ),
+            ft.Text(title_ru, color=ft.Colors.WHITE, size=28, weight=ft.FontWeight.BOLD),
+            ft.Row(
+                spacing=20,
+                alignment=ft.MainAxisAlignment.CENTER,
+                controls=[area_card, category_card_ctrl, tags_card],
+            ),
+            ft.Text(
+                "Ингредиенты:",
+                color=ft.Colors.PINK_400,
+                size=22,
+                weight=ft.FontWeight.BOLD,
+            ),
+            ft.Column(
+                spacing=8,
+                controls=[
+                    ft.Row(
+                        spacing=8,
+                        controls=[
+                            ft.Icon(
+                                ft.Icons.FIBER_MANUAL_RECORD,
+                                color=ft.Colors.PINK_400,
+                                size=26,
+                            ),
+                            ft.Text(
+                                i,
+                                color=ft.Colors.WHITE,
+                                size=18,
+                                width=page.window.width - 80,
+                            ),
+                        ],
+                    )
+                    for i in ingredients
+                ],
+            ),
+            ft.Text(
+                "Инструкции:",
+                color=ft.Colors.PINK_400,
+                size=22,
+                weight=ft.FontWeight.BOLD,
+            ),
+            ft.Column(
+                spacing=8,
+                controls=[
+                    ft.Row(
+                        spacing=8,
+                        controls=[
+                            ft.Icon(
+                                ft.Icons.FIBER_MANUAL_RECORD,
+                                color=ft.Colors.PINK_400,
+                                size=26,
+                            ),
+                            ft.Text(
+                                l,
+                                color=ft.Colors.WHITE,
+                                size=18,
+                                width=page.window.width - 80,
+                            ),
+                        ],
+                    )
+                    for l in instructions_lines
+                ],
+            ),
+        ],
+    )
+
+    get_router(page).push(
+        f"/recipe/{meal_id}",
+        ft.Column(spacing=20, expand=True, controls=[top_bar, detail_column]),
+    )
+
+def favorite_row(page: ft.Page, meal_id: str, title: str, category: str, area: str):
+    return ft.Container(
+        padding=10,
+        bgcolor="#2E2F45",
+        border_radius=ft.border_radius.all(10),
+        margin=ft.margin.symmetric(vertical=5),
+        content=ft.Row(
+            spacing=10,
+            controls=[
+                ft.Icon(ft.Icons.FAVORITE, color=ft.Colors.PINK_400, size=24),
+                ft.Column(
+                    spacing=2,
+                    expand=True,
+                    controls=[
+                        ft.Text(title, color=ft.Colors.WHITE, size=16),
+                        ft.Text(
+                            " · ".join(v for v in (category, area) if v),
+                            color=ft.Colors.GREY_400,
+                            size=12,
+                            visible=bool(category or area),
+                        ),
+                    ],
+                ),
+                ft.ElevatedButton(
+                    text="Подробнее",
+                    bgcolor=ft.Colors.PINK_400,
+                    color=ft.Colors.WHITE,
+                    on_click=lambda e, m=meal_id: open_recipe(page, m),
+                ),
+            ],
+        ),
+    )
+
+def open_favorites_screen(page: ft.Page):
+    top_bar = ft.Row(
+        [
+            ft.IconButton(
+                ft.Icons.ARROW_BACK,
+                icon_color=ft.Colors.WHITE,
+                icon_size=28,
+                on_click=lambda e: go_back(page),
+            ),
+            ft.Container(expand=True),
+        ],
+        alignment=ft.MainAxisAlignment.START,
+    )
+
+    categories, areas = user_favorites(page).facets()
+    state = {"cursor": None, "done": False}
+    lock = threading.Lock()
+
+    sort_dropdown = ft.Dropdown(
+        label="Сортировка",
+        value="added",
+        expand=True,
+        color=ft.Colors.WHITE,
+        options=[
+            ft.dropdown.Option("added", "По дате"),
+            ft.dropdown.Option("title", "По названию"),
+            ft.dropdown.Option("category", "По категории"),
+            ft.dropdown.Option("area", "По кухне"),
+        ],
+    )
+    category_dropdown = ft.Dropdown(
+        label="Категория",
+        value="",
+        expand=True,
+        color=ft.Colors.WHITE,
+        options=[ft.dropdown.Option("", "Все")] + [ft.dropdown.Option(c) for c in categories],
+    )
+    area_dropdown = ft.Dropdown(
+        label="Кухня",
+        value="",
+        expand=True,
+        color=ft.Colors.WHITE,
+        options=[ft.dropdown.Option("", "Все")] + [ft.dropdown.Option(a) for a in areas],
+    )
+    title_field = ft.TextField(
+        label="Название",
+        color=ft.Colors.WHITE,
+        border_radius=ft.border_radius.all(20),
+        prefix_icon=ft.Icon(ft.Icons.SEARCH, color=ft.Colors.PINK_400, size=20),
+    )
+
+    def load_page():
+        with lock:
+            if state["done"]:
+                return False
+            rows, cursor = user_favorites(page).page(
+                sort=sort_dropdown.value,
+                category=category_dropdown.value,
+                area=area_dropdown.value,
+                title=(title_field.value or "").strip(),
+                after=state["cursor"],
+            )
+            fav_list.controls.extend(
+                favorite_row(page, meal_id, title, category, area)
+                for meal_id, title, _, category, area in rows
+            )
+            state["cursor"] = cursor
+            state["done"] = cursor is None
+            return bool(rows)
+
+    def reload(e=None):
+        with lock:
+            fav_list.controls.clear()
+            state["cursor"] = None
+            state["done"] = False
+        load_page()
+        if not fav_list.controls:
+            fav_list.controls.append(
+                ft.Text("Избранное пустое", color=ft.Colors.WHITE, size=20)
+            )
+        page.update()
+
+    def on_scroll(e: ft.OnScrollEvent):
+        if e.pixels is None or e.max_scroll_extent is None or state["done"]:
+            return
+        if e.max_scroll_extent - e.pixels <= e.viewport_dimension and load_page():
+            fav_list.update()
+
+    fav_list = ft.ListView(expand=True, spacing=10, on_scroll_interval=100, on_scroll=on_scroll)
+    sort_dropdown.on_change = reload
+    category_dropdown.on_change = reload
+    area_dropdown.on_change = reload
+    title_field.on_submit = reload
+
+    router = get_router(page)
+    view = router.push(
+        "/favorites",
+        ft.Column(
+            spacing=20,
+            expand=True,
+            controls=[
+                top_bar,
+                ft.Text(
+                    "Все избранные рецепты",
+                    color=ft.Colors.WHITE,
+                    size=24,
+                    weight=ft.FontWeight.BOLD,
+                ),
+                ft.Container(
+                    expand=True,
+                    padding=20,
+                    content=ft.Column(
+                        spacing=10,
+                        expand=True,
+                        controls=[
+                            ft.Row([sort_dropdown, category_dropdown]),
+                            ft.Row([area_dropdown]),
+                            title_field,
+                            fav_list,
+                        ],
+                    ),
+                ),
+            ],
+        ),
+    )
+    router.subscribe(view, "favorites", reload)
+    reload()
+
+def sync_catalog():
+    catalog.sync(mealdb, translator_en_ru)
+    print(f"Готово: в {CATALOG_DB} {catalog.meal_count()} рецептов")
+
+EXPORT_WORKERS = 8
+
+def export_meal_ids(categories, queries):
+    # Списки рецептов запрашиваются по одному, по мере того как экспорт их выбирает
+    seen = set()
+    sources = [lambda c=c: load_category_meals(c) for c in categories]
+    sources += [lambda q=q: find_meals(q) for q in queries]
+    for source in sources:
+        for meal in source():
+            if meal["idMeal"] not in seen:
+                seen.add(meal["idMeal"])
+                yield meal["idMeal"]
+
+def recipe_markdown(recipe):
+    lines = [f"## {recipe['title']}", "", f"![{recipe['title']}]({recipe['image_url']})", ""]
+    about = " · ".join(v for v in (recipe["category"], recipe["area"], recipe["tags"]) if v)
+    if about:
+        lines += [f"*{about}*", ""]
+    lines += ["### Ингредиенты", ""]
+    lines += [f"- {ingredient}" for ingredient in recipe["ingredients"]]
+    lines += ["", "### Приготовление", "", recipe["instructions"].strip(), "", ""]
+    return "\n".join(lines)
+
+EXPORT_FORMATS = {
+    "jsonl": lambda recipe: json.dumps(recipe, ensure_ascii=False) + "\n",
+    "md": recipe_markdown,
+}
+
+def export_recipes(meal_ids, out, fmt="jsonl", workers=EXPORT_WORKERS):
+    """
+    Загрузка и перевод идут в workers потоках, запись — в вызывающем,
+    в порядке meal_ids. В работе держится не больше 2 * workers рецептов,
+    так что выгрузка большой категории не копит всё в памяти.
+    """
+    render = EXPORT_FORMATS[fmt]
+    written = 0
+    started = time.perf_counter()
+
+    def drain(pending, limit):
+        nonlocal written
+        while len(pending) > limit:
+            meal_id, future = pending.popleft()
+            try:
+                recipe = future.result()
+            except Exception as e:
+                print(f"Рецепт {meal_id} пропущен: {e}", file=sys.stderr)
+                continue
+            if is_untranslated(recipe):
+                print(f"Рецепт {meal_id} пропущен: переводчики недоступны", file=sys.stderr)
+            elif recipe is not None:
+                out.write(render(recipe))
+                written += 1
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export") as pool:
+        pending = deque()
+        for meal_id in meal_ids:
+            pending.append((meal_id, pool.submit(load_recipe, meal_id)))
+            drain(pending, workers * 2)
+        drain(pending, 0)
+    return written, time.perf_counter() - started
+
+def export_cli(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="начало.py export", description="Выгрузка переведённых рецептов без интерфейса"
+    )
+    parser.add_argument("-c", "--category", action="append", default=[], help="категория TheMealDB, например Beef")
+    parser.add_argument("-q", "--query", action="append", default=[], help="ингредиенты через запятую, как в поиске")
+    parser.add_argument("--all", action="store_true", help="все категории")
+    parser.add_argument("-f", "--format", choices=sorted(EXPORT_FORMATS), default="jsonl")
+    parser.add_argument("-o", "--output", default="-", help="файл, по умолчанию stdout")
+    parser.add_argument("-w", "--workers", type=int, default=EXPORT_WORKERS)
+    args = parser.parse_args(argv)
+
+    categories = args.category
+    if args.all:
+        categories = [c["strCategory"] for c in mealdb.list_categories()]
+    if not categories and not args.query:
+        parser.error("нужна хотя бы одна --category, --query или --all")
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        count, elapsed = export_recipes(export_meal_ids(categories, args.query), out, args.format, args.workers)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    rate = count / elapsed if elapsed else 0
+    print(f"Экспортировано {count} рецептов за {elapsed:.1f} с ({rate:.1f} рецептов/с)", file=sys.stderr)
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["sync"]:
+        sync_catalog()
+    elif sys.argv[1:2] == ["export"]:
+        export_cli(sys.argv[2:])
+    elif sys.argv[1:2] == ["web"]:
+        # Один процесс на всех: кэши переводов, ответов TheMealDB и картинок общие
+        WEB_MODE = True
+        ASYNC_MODE = "--async" in sys.argv[2:]
+        ft.app(
+            target=main,
+            assets_dir=ASSETS_DIR,
+            view=ft.AppView.WEB_BROWSER,
+            host=os.environ.get(WEB_HOST_ENV),
+            port=int(os.environ.get(WEB_PORT_ENV, WEB_PORT)),
+        )
+    else:
+        ASYNC_MODE = "--async" in sys.argv[1:]
+        ft.app(target=main, assets_dir=ASSETS_DIR)